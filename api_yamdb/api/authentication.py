@@ -0,0 +1,125 @@
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic, time
+
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from api.cache import get_user_version
+from reviews.constants import AUTH_USER_CACHE_SIZE, AUTH_USER_CACHE_TIMEOUT
+from reviews.models import User
+
+# Поля пользователя, которых достаточно для проверки прав доступа,
+# в порядке полей модели, которого ожидает Model.from_db.
+SNAPSHOT_FIELDS = tuple(
+    field.attname for field in User._meta.concrete_fields
+    if field.attname in (
+        'id',
+        'username',
+        'role',
+        'is_staff',
+        'is_superuser',
+        'is_active'
+    )
+)
+
+
+class TokenUserCache:
+    """
+    Ограниченный по размеру LRU-кэш с временем жизни записей.
+
+    Хранится в памяти процесса, поэтому записи дополнительно
+    сверяются с версией пользователя в кэше, общем для всех процессов.
+    """
+
+    def __init__(self, max_size, timeout):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.entries = OrderedDict()
+        self.lock = Lock()
+
+    def get(self, key):
+        """
+        Возвращает значение или None, если записи нет или она устарела.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires <= monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout=None):
+        """
+        Сохраняет значение, вытесняя давно не использованные записи.
+        """
+        if timeout is None or timeout > self.timeout:
+            timeout = self.timeout
+        with self.lock:
+            self.entries[key] = (monotonic() + timeout, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+token_user_cache = TokenUserCache(
+    AUTH_USER_CACHE_SIZE,
+    AUTH_USER_CACHE_TIMEOUT
+)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    Аутентификация по JWT, запоминающая проверенные токены.
+
+    Для известного токена не проверяется подпись и не загружается
+    пользователь: request.user собирается из снимка полей
+    SNAPSHOT_FIELDS, остальные поля догружаются из БД при обращении.
+    Снимок сверяется с версией пользователя в общем кэше без запросов
+    к БД и сбрасывается при любом изменении или удалении пользователя
+    в любом процессе.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        cached = token_user_cache.get(raw_token)
+        if cached is not None:
+            version, user_id, values, validated_token = cached
+            if version == get_user_version(user_id):
+                return (
+                    User.from_db(DEFAULT_DB_ALIAS, SNAPSHOT_FIELDS, values),
+                    validated_token
+                )
+        validated_token = self.get_validated_token(raw_token)
+        if api_settings.CHECK_REVOKE_TOKEN:
+            return self.get_user(validated_token), validated_token
+        # Версия читается до загрузки пользователя: если он изменится
+        # после чтения, снимок не совпадёт с новой версией.
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        version = get_user_version(user_id)
+        user = self.get_user(validated_token)
+        token_user_cache.set(
+            raw_token,
+            (
+                version,
+                user_id,
+                tuple(getattr(user, field) for field in SNAPSHOT_FIELDS),
+                validated_token
+            ),
+            validated_token['exp'] - time()
+        )
+        return user, validated_token
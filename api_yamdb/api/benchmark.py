@@ -0,0 +1,70 @@
+from statistics import median
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+
+class BenchmarkCommand(BaseCommand):
+    """
+    Базовая команда замеров производительности.
+
+    Замеры выполняются в отдельной временной базе данных, которая
+    создаётся по настройкам тестовой БД и удаляется после запуска.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Количество повторов каждого замера.'
+        )
+
+    def handle(self, *args, **options):
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(
+            verbosity=0,
+            autoclobber=True,
+            serialize=False
+        )
+        try:
+            self.run_benchmark(**options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def run_benchmark(self, **options):
+        raise NotImplementedError
+
+    def measure(self, label, func, repeat):
+        """
+        Выполняет func repeat раз и выводит медиану и максимум в мс.
+        """
+        timings = []
+        for _ in range(repeat):
+            start = perf_counter()
+            func()
+            timings.append(perf_counter() - start)
+        result = median(timings) * 1000
+        self.stdout.write(
+            f'{label}: медиана {result:.2f} мс, '
+            f'максимум {max(timings) * 1000:.2f} мс'
+        )
+        return result
+
+    def bulk_insert(self, table, columns, rows, batch_size=10000):
+        """
+        Быстро заполняет таблицу строками в обход ORM.
+        """
+        placeholders = ', '.join(['%s'] * len(columns))
+        sql = (f'INSERT INTO {table} ({", ".join(columns)}) '
+               f'VALUES ({placeholders})')
+        with connection.cursor() as cursor:
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) == batch_size:
+                    cursor.executemany(sql, batch)
+                    batch = []
+            if batch:
+                cursor.executemany(sql, batch)
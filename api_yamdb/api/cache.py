@@ -0,0 +1,205 @@
+from hashlib import md5
+from time import time
+from urllib.parse import urlencode
+from uuid import uuid4
+
+from django.core.cache import cache, caches
+
+from reviews.constants import TITLE_LIST_CACHE_TIMEOUT, USER_VERSION_TIMEOUT
+from reviews.models import CacheVersion
+from reviews.utils import batches
+
+TITLES_SCOPE = 'titles'
+RATINGS_SCOPE = 'ratings'
+USERS_SCOPE = 'users'
+# Версия области, которую ещё ни разу не меняли.
+INITIAL_VERSION = '0-0'
+
+shared_cache = caches['shared']
+
+
+def get_title_scope(title_id):
+    return f'title:{title_id}'
+
+
+def get_reviews_scope(title_id):
+    return f'title:{title_id}:reviews'
+
+
+def get_comments_scope(review_id):
+    return f'review:{review_id}:comments'
+
+
+def get_user_scope(user_id):
+    return f'user:{user_id}'
+
+
+def get_deleted_reviews_scopes(reviews):
+    """
+    Возвращает области, которые меняет удаление отзывов.
+
+    reviews - словарь id удалённых отзывов -> id их произведений.
+    """
+    if not reviews:
+        return ()
+    title_ids = set(reviews.values())
+    return (
+        RATINGS_SCOPE,
+        *map(get_title_scope, title_ids),
+        *map(get_reviews_scope, title_ids),
+        *map(get_comments_scope, reviews)
+    )
+
+
+def get_deleted_comments_scopes(reviews):
+    """
+    Возвращает области, которые меняет удаление комментариев.
+
+    reviews - словарь id отзывов удалённых комментариев
+    -> id их произведений.
+    """
+    return (
+        *map(get_comments_scope, reviews),
+        *map(get_reviews_scope, set(reviews.values()))
+    )
+
+
+def make_version():
+    """
+    Создаёт новую версию: время создания и случайный суффикс.
+    """
+    return f'{time():.6f}-{uuid4().hex}'
+
+
+def get_version_time(version):
+    """
+    Возвращает время создания версии в секундах от начала эпохи.
+    """
+    return float(version.split('-', 1)[0])
+
+
+def get_versions(*scopes):
+    """
+    Возвращает текущие версии областей кэша одним запросом к БД.
+
+    Для области, которую ещё не меняли, возвращается INITIAL_VERSION:
+    чтение не создаёт записей, даже если в URL несуществующий id.
+    """
+    stored = {}
+    for batch in batches(set(scopes)):
+        stored.update(
+            CacheVersion.objects.filter(scope__in=batch)
+            .values_list('scope', 'version')
+        )
+    return [stored.get(scope, INITIAL_VERSION) for scope in scopes]
+
+
+def get_version(scope):
+    """
+    Возвращает текущую версию области кэша.
+    """
+    return get_versions(scope)[0]
+
+
+def bump_version(*scopes):
+    """
+    Делает недоступными все записи кэша указанных областей.
+
+    Обычно это один UPDATE; области, которые меняются впервые,
+    добавляются вставкой.
+    """
+    version = make_version()
+    for batch in batches(set(scopes)):
+        updated = CacheVersion.objects.filter(scope__in=batch).update(
+            version=version
+        )
+        if updated < len(batch):
+            CacheVersion.objects.bulk_create(
+                [CacheVersion(scope=scope, version=version)
+                 for scope in batch],
+                ignore_conflicts=True
+            )
+
+
+def get_user_version(user_id):
+    """
+    Возвращает версию пользователя из общего для процессов кэша.
+
+    Если версии нет или она истекла, создаётся новая: снимки,
+    сверявшиеся со старой версией, перестают совпадать.
+    """
+    key = get_user_scope(user_id)
+    version = shared_cache.get(key)
+    if version is None:
+        version = make_version()
+        if not shared_cache.add(key, version, USER_VERSION_TIMEOUT):
+            # Версию параллельно создал другой запрос.
+            version = shared_cache.get(key, version)
+    return version
+
+
+def bump_user_version(user_id):
+    """
+    Меняет версию пользователя, сбрасывая снимки его токенов.
+    """
+    shared_cache.set(
+        get_user_scope(user_id), make_version(), USER_VERSION_TIMEOUT
+    )
+
+
+def bump_all_versions():
+    """
+    Делает недоступными все ответы и страницы в кэше: каждый из них
+    зависит хотя бы от одной из общих областей.
+    """
+    bump_version(TITLES_SCOPE, RATINGS_SCOPE, USERS_SCOPE)
+
+
+def get_title_list_key(request):
+    """
+    Строит ключ страницы списка произведений по нормализованному запросу.
+    """
+    params = urlencode(sorted(
+        (name, value)
+        for name in request.query_params
+        for value in request.query_params.getlist(name)
+    ))
+    digest = md5(f'{request.get_host()}?{params}'.encode()).hexdigest()
+    return f'titles:list:{digest}'
+
+
+def get_title_list_scopes(data):
+    """
+    Возвращает области, от которых зависит страница списка:
+    общую область произведений и каждое произведение на странице.
+    """
+    return (
+        TITLES_SCOPE,
+        *(get_title_scope(title['id']) for title in data['results'])
+    )
+
+
+def set_title_list_page(key, data):
+    """
+    Сохраняет страницу списка вместе с версиями её произведений.
+
+    Вызывается в транзакции, в которой строилась страница: иначе
+    к старым данным может попасть версия после их изменения.
+    """
+    scopes = get_title_list_scopes(data)
+    cache.set(
+        key,
+        (dict(zip(scopes, get_versions(*scopes))), data),
+        TITLE_LIST_CACHE_TIMEOUT
+    )
+
+
+def get_title_list_page(key):
+    """
+    Возвращает из кэша страницу списка и версии её произведений
+    на момент сохранения или None, если страницы нет.
+
+    Версии сверяются с текущими вызывающим кодом: так их можно
+    прочитать одним запросом вместе с другими.
+    """
+    return cache.get(key)
@@ -1,10 +1,43 @@
+import sys
+
+from django.db.models import Count
 from django_filters import (
     NumberFilter,
+    ChoiceFilter,
     CharFilter,
     FilterSet
 )
+from rest_framework.exceptions import ValidationError
+
+from api.pagination import KeysetPagination
+from reviews.constants import (
+    GENRE_MATCH_ALL,
+    GENRE_MATCH_ANY,
+    MESSAGE_SEARCH_CURSOR,
+    USER_SEARCH_CONTAINS,
+    USER_SEARCH_EXACT,
+    USER_SEARCH_PREFIX
+)
+from reviews.models import Genre, Title, User
+from reviews.search import search_titles
 
-from reviews.models import Title
+# Суррогатные пары не бывают отдельными символами строки в БД.
+SURROGATES = range(0xD800, 0xE000)
+
+
+def get_prefix_upper_bound(prefix):
+    """
+    Возвращает наименьшую строку, большую всех строк с этим префиксом,
+    или None, если такой строки нет: префикс состоит только из
+    последних символов Unicode.
+    """
+    prefix = prefix.rstrip(chr(sys.maxunicode))
+    if not prefix:
+        return None
+    code = ord(prefix[-1]) + 1
+    if code in SURROGATES:
+        code = SURROGATES.stop
+    return prefix[:-1] + chr(code)
 
 
 class TitleFilter(FilterSet):
@@ -16,9 +49,13 @@ class TitleFilter(FilterSet):
         field_name='category__slug',
         lookup_expr='iexact'
     )
-    genre = CharFilter(
-        field_name='genre__slug',
-        lookup_expr='contains'
+    genre = CharFilter(method='filter_genre')
+    genre_match = ChoiceFilter(
+        choices=(
+            (GENRE_MATCH_ANY, GENRE_MATCH_ANY),
+            (GENRE_MATCH_ALL, GENRE_MATCH_ALL)
+        ),
+        method='filter_genre_match'
     )
     name = CharFilter(
         field_name='name',
@@ -27,7 +64,102 @@ class TitleFilter(FilterSet):
     year = NumberFilter(
         field_name='year',
         lookup_expr='exact')
+    search = CharFilter(method='filter_search')
 
     class Meta:
         model = Title
         exclude = '__all__'
+
+    def filter_genre(self, queryset, name, value):
+        """
+        Отбирает произведения по слагам жанров через промежуточную таблицу.
+
+        Слаги передаются через запятую или повторением параметра;
+        genre_match=all требует наличия всех жанров, any - любого из них.
+        """
+        values = (self.data.getlist(name)
+                  if hasattr(self.data, 'getlist') else [value])
+        slugs = {slug for item in values for slug in item.split(',') if slug}
+        genre_ids = list(
+            Genre.objects.filter(slug__in=slugs).values_list('id', flat=True)
+        )
+        title_genres = Title.genre.through.objects.filter(
+            genre_id__in=genre_ids
+        ).values('title_id')
+        if self.form.cleaned_data.get('genre_match') == GENRE_MATCH_ALL:
+            if len(genre_ids) < len(slugs):
+                return queryset.none()
+            title_genres = title_genres.annotate(
+                matched=Count('genre_id')
+            ).filter(matched=len(genre_ids)).values('title_id')
+        return queryset.filter(id__in=title_genres)
+
+    @staticmethod
+    def filter_genre_match(queryset, name, value):
+        """
+        Режим сопоставления жанров учитывается в filter_genre.
+        """
+        return queryset
+
+    def filter_search(self, queryset, name, value):
+        """
+        Полнотекстовый поиск по названию и описанию произведения.
+
+        Курсор упорядочивает записи по (year, id) и отбросил бы
+        сортировку по релевантности, поэтому вместе с ним поиск
+        отклоняется.
+        """
+        if (self.request is not None
+                and KeysetPagination.cursor_query_param
+                in self.request.query_params):
+            raise ValidationError({name: [MESSAGE_SEARCH_CURSOR]})
+        return search_titles(queryset, value)
+
+
+class UserFilter(FilterSet):
+    """
+    Фильтр для модели пользователей.
+    """
+
+    search = CharFilter(method='filter_search')
+    search_mode = ChoiceFilter(
+        choices=(
+            (USER_SEARCH_PREFIX, USER_SEARCH_PREFIX),
+            (USER_SEARCH_EXACT, USER_SEARCH_EXACT),
+            (USER_SEARCH_CONTAINS, USER_SEARCH_CONTAINS)
+        ),
+        method='filter_search_mode'
+    )
+
+    class Meta:
+        model = User
+        exclude = '__all__'
+
+    def filter_search(self, queryset, name, value):
+        """
+        Ищет пользователей по никнейму без учёта регистра.
+
+        prefix и exact - диапазон и равенство по индексу
+        username_folded; contains читает всю таблицу и включается
+        только явно через search_mode=contains.
+        """
+        mode = self.form.cleaned_data.get('search_mode') or USER_SEARCH_PREFIX
+        if mode == USER_SEARCH_CONTAINS:
+            return queryset.filter(username__icontains=value)
+        value = value.casefold()
+        if mode == USER_SEARCH_EXACT:
+            return queryset.filter(username_folded=value)
+        # Все строки с префиксом value лежат между value и value
+        # с увеличенным на единицу последним символом.
+        queryset = queryset.filter(username_folded__gte=value)
+        upper = get_prefix_upper_bound(value)
+        if upper is None:
+            return queryset
+        return queryset.filter(username_folded__lt=upper)
+
+    @staticmethod
+    def filter_search_mode(queryset, name, value):
+        """
+        Режим поиска учитывается в filter_search.
+        """
+        return queryset
@@ -0,0 +1,67 @@
+import random
+import tracemalloc
+from datetime import timedelta
+
+from django.db import connection
+from django.utils import timezone
+
+from api.benchmark import BenchmarkCommand
+from api.utils import stream_reviews
+from reviews.constants import EXPORT_CSV, EXPORT_NDJSON, RATING_PRIOR_MEAN
+from reviews.models import Review, Title, User
+
+REVIEWS_STEPS = (1000, 10000, 100000)
+
+
+class Command(BenchmarkCommand):
+    """
+    Замер выгрузки отзывов при росте их числа у произведения.
+    """
+
+    help = ('Замер выгрузки /titles/{id}/reviews/export/ на синтетических '
+            'данных: python manage.py bench_export --repeat 5')
+
+    def run_benchmark(self, **options):
+        generator = random.Random(max(REVIEWS_STEPS))
+        now = timezone.now()
+        User.objects.bulk_create(
+            User(username=f'user{pk}', username_folded=f'user{pk}',
+                 email=f'user{pk}@yamdb.fake')
+            for pk in range(max(REVIEWS_STEPS))
+        )
+        user_ids = list(User.objects.values_list('pk', flat=True))
+        self.bulk_insert(
+            Title._meta.db_table,
+            ('id', 'name', 'year', 'description', 'score_sum',
+             'review_count', 'weighted_rating'),
+            ((pk, f'Произведение {pk}', 2000, '', 0, 0, RATING_PRIOR_MEAN)
+             for pk in range(1, len(REVIEWS_STEPS) + 1))
+        )
+        for title_id, count in enumerate(REVIEWS_STEPS, 1):
+            self.bulk_insert(
+                Review._meta.db_table,
+                ('title_id', 'author_id', 'text', 'score', 'pub_date',
+                 'comment_count'),
+                ((title_id, author_id, 'Отзыв ' * 20,
+                  generator.randint(1, 10),
+                  now - timedelta(seconds=generator.randint(0, 10 ** 8)), 0)
+                 for author_id in user_ids[:count])
+            )
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+        for title_id, count in enumerate(REVIEWS_STEPS, 1):
+            for output in (EXPORT_NDJSON, EXPORT_CSV):
+                self.measure(
+                    f'{count} отзывов, {output}: первый фрагмент',
+                    lambda: next(stream_reviews(title_id, output)),
+                    options['repeat']
+                )
+                tracemalloc.start()
+                size = sum(map(len, stream_reviews(title_id, output)))
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                self.stdout.write(
+                    f'{count} отзывов, {output}: {size / 2 ** 20:.1f} МБ '
+                    f'выгрузки, пик памяти {peak / 2 ** 20:.1f} МБ'
+                )
@@ -0,0 +1,114 @@
+import random
+from datetime import timedelta
+
+from django.db import connection
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.benchmark import BenchmarkCommand
+from api.pagination import FeedPagination
+from api.utils import get_feed_querysets
+from reviews.constants import FEED_LOOKBACK_DAYS, RATING_PRIOR_MEAN
+from reviews.models import Comment, Review, Title, User
+
+HISTORY_STEPS = (10, 100, 1000, 10000)
+HISTORY_DAYS = 365 * 3
+OTHER_REVIEWS_PER_TITLE = 20
+COMMENTS_PER_REVIEW = 2
+
+
+class Command(BenchmarkCommand):
+    """
+    Замер ленты пользователя при росте его истории отзывов.
+    """
+
+    help = ('Замер ленты /users/me/feed/ на синтетических данных: '
+            'python manage.py bench_feed --users 2000')
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--users',
+            type=int,
+            default=2000,
+            help='Количество авторов чужих отзывов в тестовой базе.'
+        )
+
+    def run_benchmark(self, **options):
+        generator = random.Random(options['users'])
+        now = timezone.now()
+        titles = max(HISTORY_STEPS)
+        self.stdout.write(
+            f'Заполнение базы: {titles} произведений, '
+            f'{titles * OTHER_REVIEWS_PER_TITLE} чужих отзывов...'
+        )
+        User.objects.bulk_create(
+            User(username=f'user{pk}', username_folded=f'user{pk}',
+                 email=f'user{pk}@yamdb.fake')
+            for pk in range(options['users'] + 1)
+        )
+        user_ids = list(User.objects.values_list('pk', flat=True))
+        reader, authors = user_ids[0], user_ids[1:]
+        self.bulk_insert(
+            Title._meta.db_table,
+            ('id', 'name', 'year', 'description', 'score_sum',
+             'review_count', 'weighted_rating'),
+            ((pk, f'Произведение {pk}', 2000, '', 0, 0, RATING_PRIOR_MEAN)
+             for pk in range(1, titles + 1))
+        )
+
+        def random_date():
+            return now - timedelta(
+                seconds=generator.randint(0, HISTORY_DAYS * 24 * 3600)
+            )
+
+        self.bulk_insert(
+            Review._meta.db_table,
+            ('title_id', 'author_id', 'text', 'score', 'pub_date',
+             'comment_count'),
+            ((title_id, author_id, 'Отзыв', generator.randint(1, 10),
+              random_date(), 0)
+             for title_id in range(1, titles + 1)
+             for author_id in generator.sample(authors,
+                                               OTHER_REVIEWS_PER_TITLE))
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+        reader = User.objects.get(pk=reader)
+        request = Request(APIRequestFactory().get('/api/v1/users/me/feed/'))
+
+        def first_page():
+            FeedPagination().paginate_feed(
+                get_feed_querysets(reader), request
+            )
+
+        history = 0
+        for step in HISTORY_STEPS:
+            self.bulk_insert(
+                Review._meta.db_table,
+                ('title_id', 'author_id', 'text', 'score', 'pub_date',
+                 'comment_count'),
+                ((title_id, reader.pk, 'Мой отзыв', 5, random_date(), 0)
+                 for title_id in range(history + 1, step + 1))
+            )
+            new_reviews = Review.objects.filter(
+                author=reader, title_id__gt=history
+            ).values_list('pk', flat=True)
+            self.bulk_insert(
+                Comment._meta.db_table,
+                ('review_id', 'author_id', 'text', 'pub_date'),
+                ((review_id, generator.choice(authors), 'Ответ',
+                  random_date())
+                 for review_id in new_reviews
+                 for _ in range(COMMENTS_PER_REVIEW))
+            )
+            history = step
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+            self.measure(
+                f'История {step} отзывов, окно {FEED_LOOKBACK_DAYS} дней',
+                first_page,
+                options['repeat']
+            )
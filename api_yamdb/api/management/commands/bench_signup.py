@@ -0,0 +1,65 @@
+from time import perf_counter
+
+from api.benchmark import BenchmarkCommand
+from api.serializers import RegistrationSerializer
+from reviews.models import User
+
+
+class Command(BenchmarkCommand):
+    """
+    Замер пропускной способности регистрации.
+    """
+
+    help = ('Замер регистрации /auth/signup/ на синтетических данных: '
+            'python manage.py bench_signup --users 100000')
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--users',
+            type=int,
+            default=100000,
+            help='Количество уже зарегистрированных пользователей.'
+        )
+        parser.add_argument(
+            '--signups',
+            type=int,
+            default=2000,
+            help='Количество регистраций в каждом замере.'
+        )
+
+    def run_benchmark(self, **options):
+        self.stdout.write(
+            f'Заполнение базы: {options["users"]} пользователей...'
+        )
+        self.bulk_insert(
+            User._meta.db_table,
+            ('password', 'is_superuser', 'username', 'username_folded',
+             'first_name', 'last_name', 'email', 'is_staff', 'is_active',
+             'date_joined', 'role', 'bio'),
+            (('', False, f'user{pk}', f'user{pk}', '', '',
+              f'user{pk}@yamdb.fake', False, True, '2020-01-01 00:00:00',
+              'user', '')
+             for pk in range(options['users']))
+        )
+
+        def signup(username, email):
+            serializer = RegistrationSerializer(
+                data={'username': username, 'email': email}
+            )
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+
+        cases = (
+            ('новые пользователи', 'new{}', 'new{}@yamdb.fake'),
+            ('повторная регистрация', 'new{}', 'new{}@yamdb.fake'),
+        )
+        for label, username, email in cases:
+            start = perf_counter()
+            for number in range(options['signups']):
+                signup(username.format(number), email.format(number))
+            elapsed = perf_counter() - start
+            self.stdout.write(
+                f'{label}: {options["signups"] / elapsed:.0f} регистраций/с, '
+                f'{elapsed / options["signups"] * 1000:.2f} мс на регистрацию'
+            )
@@ -0,0 +1,78 @@
+import random
+
+from django.db import connection
+
+from api.benchmark import BenchmarkCommand
+from api.filters import TitleFilter
+from reviews.constants import RATING_PRIOR_MEAN
+from reviews.models import Title
+from reviews.search import rebuild_title_index
+
+WORDS = (
+    'звезда', 'война', 'мир', 'тень', 'город', 'море', 'ветер', 'ночь',
+    'свет', 'дорога', 'сердце', 'песня', 'зима', 'огонь', 'время',
+    'star', 'night', 'river', 'ghost', 'road', 'dream', 'stone', 'king',
+)
+RARE_WORD = 'Квазар'
+RARE_EVERY = 10000
+
+
+class Command(BenchmarkCommand):
+    """
+    Сравнение полнотекстового поиска и фильтра name__icontains.
+    """
+
+    help = ('Замер поиска произведений на синтетических данных: '
+            'python manage.py bench_title_search --titles 1000000')
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--titles',
+            type=int,
+            default=1000000,
+            help='Количество произведений в тестовой базе.'
+        )
+
+    @staticmethod
+    def generate_titles(amount):
+        generator = random.Random(amount)
+        for pk in range(1, amount + 1):
+            name = ' '.join(generator.sample(WORDS, 3)).capitalize()
+            if pk % RARE_EVERY == 0:
+                name = f'{RARE_WORD} {name}'
+            description = ' '.join(generator.choices(WORDS, k=8))
+            yield (pk, name, generator.randint(1900, 2020), description,
+                   0, 0, RATING_PRIOR_MEAN)
+
+    def run_benchmark(self, **options):
+        self.stdout.write(f'Заполнение базы: {options["titles"]} '
+                          f'произведений...')
+        self.bulk_insert(
+            Title._meta.db_table,
+            ('id', 'name', 'year', 'description', 'score_sum',
+             'review_count', 'weighted_rating'),
+            self.generate_titles(options['titles'])
+        )
+        self.measure('Построение полнотекстового индекса',
+                     rebuild_title_index, 1)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+        queryset = Title.objects.select_related(
+            'category'
+        ).prefetch_related('genre').order_by('-year', '-id')
+
+        def first_page(params):
+            def run():
+                filtered = TitleFilter(params, queryset=queryset).qs
+                filtered.count()
+                list(filtered[:5])
+            return run
+
+        for term in (RARE_WORD.lower(), 'звезда', 'ghost'):
+            self.stdout.write(f'Запрос «{term}»:')
+            self.measure('  name=… (icontains)',
+                         first_page({'name': term}), options['repeat'])
+            self.measure('  search=… (FTS5)',
+                         first_page({'search': term}), options['repeat'])
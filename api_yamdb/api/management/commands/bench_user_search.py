@@ -0,0 +1,74 @@
+import random
+from string import ascii_lowercase
+
+from django.db import connection
+
+from api.benchmark import BenchmarkCommand
+from api.filters import UserFilter
+from reviews.constants import (
+    USER_SEARCH_CONTAINS,
+    USER_SEARCH_EXACT,
+    USER_SEARCH_PREFIX
+)
+from reviews.models import User
+
+PAGE_SIZE = 10
+
+
+class Command(BenchmarkCommand):
+    """
+    Сравнение поиска пользователей по подстроке и по индексу.
+    """
+
+    help = ('Замер поиска пользователей на синтетических данных: '
+            'python manage.py bench_user_search --users 1000000')
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--users',
+            type=int,
+            default=1000000,
+            help='Количество пользователей в тестовой базе.'
+        )
+
+    @staticmethod
+    def generate_users(amount):
+        generator = random.Random(amount)
+        for pk in range(1, amount + 1):
+            username = ''.join(generator.choices(ascii_lowercase, k=6))
+            username = f'{username.capitalize()}{pk}'
+            yield ('', False, username, username.casefold(), '', '',
+                   f'{username}@yamdb.fake', False, True,
+                   '2020-01-01 00:00:00', 'user', '')
+
+    def run_benchmark(self, **options):
+        self.stdout.write(f'Заполнение базы: {options["users"]} '
+                          f'пользователей...')
+        self.bulk_insert(
+            User._meta.db_table,
+            ('password', 'is_superuser', 'username', 'username_folded',
+             'first_name', 'last_name', 'email', 'is_staff', 'is_active',
+             'date_joined', 'role', 'bio'),
+            self.generate_users(options['users'])
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        username = User.objects.get(pk=options['users'] // 2).username
+
+        def first_page(params):
+            def run():
+                filtered = UserFilter(params, queryset=User.objects.all()).qs
+                filtered.count()
+                list(filtered[:PAGE_SIZE])
+            return run
+
+        for term in (username[:3], username[:6], username):
+            self.stdout.write(f'Запрос «{term}»:')
+            for mode in (USER_SEARCH_CONTAINS, USER_SEARCH_PREFIX,
+                         USER_SEARCH_EXACT):
+                self.measure(
+                    f'  search_mode={mode}',
+                    first_page({'search': term, 'search_mode': mode}),
+                    options['repeat']
+                )
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from api.throttling import purge_idle_buckets
+from reviews.constants import THROTTLE_PURGE_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    """
+    Команда для удаления наполнившихся корзин ограничения запросов.
+    """
+
+    help = ('Удаление неактивных корзин ограничения частоты запросов: '
+            'python manage.py purge_throttle_buckets')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=THROTTLE_PURGE_BATCH_SIZE,
+            help='Количество корзин, удаляемых одним запросом.'
+        )
+
+    def handle(self, *args, **options):
+        """
+        Удаляет наполнившиеся корзины и выводит их количество.
+        """
+        purged = purge_idle_buckets(options['batch_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Удалено корзин: {purged}.')
+        )
@@ -0,0 +1,166 @@
+from hashlib import md5
+
+from django.db import transaction
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from api.cache import (
+    get_title_list_key,
+    get_title_list_page,
+    get_version_time,
+    get_versions,
+    set_title_list_page
+)
+
+
+class ConditionalGetMixin:
+    """
+    Отвечает 304 на условные GET-запросы к списку и объекту
+    до выполнения запроса к БД и сериализации.
+
+    ETag строится из версий областей кэша, которые возвращает
+    get_version_scopes; версии меняются при каждой записи.
+    Версии областей get_extra_version_scopes, нужные обработчику,
+    читаются тем же запросом и сохраняются в self.versions.
+    Last-Modified точен до секунды, поэтому клиентам
+    следует отдавать предпочтение If-None-Match.
+    Перед ответом 304 проверяется, что ресурс из URL существует.
+    """
+
+    def get_version_scopes(self):
+        """
+        Возвращает области кэша, от которых зависит ответ.
+        """
+        raise NotImplementedError
+
+    def get_extra_version_scopes(self):
+        """
+        Возвращает области кэша, версии которых нужны обработчику,
+        но не входят в ETag.
+        """
+        return ()
+
+    def check_resource_exists(self):
+        """
+        Отвечает 404, если объекта или родителя из URL нет.
+        """
+        if self.action == 'retrieve':
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            if not self.get_queryset().filter(**{
+                self.lookup_field: self.kwargs[lookup_url_kwarg]
+            }).exists():
+                raise Http404
+        elif isinstance(self, NestedResourceMixin):
+            self.get_parent()
+
+    def get_conditional_response(self, handler, request, *args, **kwargs):
+        """
+        Выполняет обработчик, только если у клиента устаревшая версия.
+        """
+        scopes = self.get_version_scopes()
+        extra_scopes = self.get_extra_version_scopes()
+        versions = get_versions(*scopes, *extra_scopes)
+        self.versions = dict(zip((*scopes, *extra_scopes), versions))
+        versions = versions[:len(scopes)]
+        etag = quote_etag(md5(':'.join(
+            [request.accepted_renderer.format, *versions]
+        ).encode()).hexdigest())
+        last_modified = int(max(map(get_version_time, versions)))
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        else:
+            self.check_resource_exists()
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class TitleListCacheMixin:
+    """
+    Отдаёт анонимным пользователям страницы списка из кэша.
+
+    Страница хранится с версиями своих произведений и перед выдачей
+    сверяется с ними, поэтому отзыв сбрасывает только страницы
+    с этим произведением. Текущие версии читает ConditionalGetMixin
+    вместе с версиями ETag: области страницы возвращает
+    get_cached_page_scopes.
+    """
+
+    cached_page = None
+
+    def get_cached_page_scopes(self):
+        """
+        Загружает страницу анонимного запроса списка из кэша
+        и возвращает области, с версиями которых её нужно сверить.
+        """
+        if self.action != 'list' or self.request.user.is_authenticated:
+            return ()
+        self.cached_page = get_title_list_page(
+            get_title_list_key(self.request)
+        )
+        if self.cached_page is None:
+            return ()
+        return tuple(self.cached_page[0])
+
+    def list(self, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return super().list(request, *args, **kwargs)
+        if self.cached_page is not None:
+            page_versions, data = self.cached_page
+            if all(
+                self.versions.get(scope) == version
+                for scope, version in page_versions.items()
+            ):
+                return Response(data)
+        with transaction.atomic():
+            response = super().list(request, *args, **kwargs)
+            set_title_list_page(get_title_list_key(request), response.data)
+        return response
+
+
+class NestedResourceMixin:
+    """
+    Находит родительский объект по цепочке id из URL одним запросом
+    и запоминает его на время обработки запроса.
+
+    parent_lookups сопоставляет поля parent_queryset
+    с именованными аргументами URL.
+    """
+
+    parent_queryset = None
+    parent_lookups = {}
+
+    def get_parent_filters(self, prefix=''):
+        """
+        Возвращает условия отбора по цепочке id из URL.
+        """
+        return {
+            f'{prefix}{field}': self.kwargs.get(kwarg)
+            for field, kwarg in self.parent_lookups.items()
+        }
+
+    def get_parent(self):
+        """
+        Возвращает родительский объект или 404, если цепочка неверна.
+        """
+        if not hasattr(self, '_parent'):
+            self._parent = get_object_or_404(
+                self.parent_queryset.all(), **self.get_parent_filters()
+            )
+        return self._parent
@@ -0,0 +1,263 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    BasePagination,
+    LimitOffsetPagination,
+    PageNumberPagination
+)
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from reviews.constants import MAX_PAGE_LIMIT
+
+
+def dump_cursor(values):
+    """
+    Кодирует значения позиции курсора для передачи в URL.
+    """
+    return urlsafe_b64encode(json.dumps(values).encode()).decode('ascii')
+
+
+def load_cursor(encoded):
+    """
+    Декодирует значения позиции курсора из URL.
+    """
+    return json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+
+
+class KeysetPagination(BasePagination):
+    """
+    Пагинация по курсору на основе пары (ключ сортировки, id).
+
+    Курсор хранит значения ключа и id последней записи страницы,
+    поэтому любая страница выбирается диапазоном по составному
+    индексу без OFFSET и без подсчёта общего количества записей.
+    """
+
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Некорректный курсор.'
+
+    def __init__(self, ordering, page_size):
+        self.ordering = ordering
+        self.page_size = page_size
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Возвращает страницу записей, следующих за курсором.
+        """
+        self.base_url = request.build_absolute_uri()
+        key, tiebreaker = (field.lstrip('-') for field in self.ordering)
+        self.key_field = queryset.model._meta.get_field(key)
+        position, reverse = self.decode_cursor(request)
+
+        descending = self.ordering[0].startswith('-') != reverse
+        if position is not None:
+            key_value, pk = position
+            if descending:
+                queryset = queryset.filter(
+                    **{f'{key}__lte': key_value}
+                ).exclude(**{key: key_value, f'{tiebreaker}__gte': pk})
+            else:
+                queryset = queryset.filter(
+                    **{f'{key}__gte': key_value}
+                ).exclude(**{key: key_value, f'{tiebreaker}__lte': pk})
+        prefix = '-' if descending else ''
+        results = list(queryset.order_by(
+            f'{prefix}{key}', f'{prefix}{tiebreaker}'
+        )[:self.page_size + 1])
+
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data)
+        ]))
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def decode_cursor(self, request):
+        """
+        Разбирает курсор запроса в позицию и направление обхода.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            key_value, pk, reverse = load_cursor(encoded)
+            return (self.key_field.to_python(key_value), int(pk)), reverse
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, obj, reverse):
+        """
+        Строит ссылку на страницу, соседнюю с записью obj.
+        """
+        return replace_query_param(
+            self.base_url,
+            self.cursor_query_param,
+            dump_cursor(
+                [self.key_field.value_to_string(obj), obj.pk, reverse]
+            )
+        )
+
+
+class KeysetModeMixin:
+    """
+    Переключает пагинатор в режим курсора, если в запросе
+    передан параметр cursor; без него сохраняется прежний режим.
+    """
+
+    cursor_ordering = None
+
+    def get_cursor_page_size(self, request):
+        raise NotImplementedError
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if KeysetPagination.cursor_query_param in request.query_params:
+            self.keyset = KeysetPagination(
+                self.cursor_ordering,
+                self.get_cursor_page_size(request)
+            )
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class TitlePagination(KeysetModeMixin, LimitOffsetPagination):
+    """
+    Пагинация произведений: limit/offset или курсор по (year, id).
+    """
+
+    max_limit = MAX_PAGE_LIMIT
+    cursor_ordering = ('-year', '-id')
+
+    def get_cursor_page_size(self, request):
+        return self.get_limit(request)
+
+
+class ThreadPagination(KeysetModeMixin, PageNumberPagination):
+    """
+    Пагинация отзывов и комментариев: номер страницы
+    или курсор по (pub_date, id).
+    """
+
+    page_size_query_param = 'page_size'
+    max_page_size = MAX_PAGE_LIMIT
+    cursor_ordering = ('pub_date', 'id')
+
+    def get_cursor_page_size(self, request):
+        return self.get_page_size(request)
+
+
+class FeedPagination(PageNumberPagination):
+    """
+    Пагинация ленты из нескольких наборов записей по курсору
+    (pub_date, тип, id) в порядке убывания.
+
+    Из каждого набора по индексу читается не больше page_size + 1
+    записей после курсора, после чего они сливаются в одну страницу.
+    """
+
+    page_size_query_param = 'page_size'
+    max_page_size = MAX_PAGE_LIMIT
+    cursor_query_param = KeysetPagination.cursor_query_param
+    invalid_cursor_message = KeysetPagination.invalid_cursor_message
+
+    def paginate_feed(self, querysets, request):
+        """
+        Возвращает страницу пар (тип, запись), следующих за курсором.
+
+        querysets сопоставляет тип записи с набором записей.
+        """
+        self.base_url = request.build_absolute_uri()
+        page_size = self.get_page_size(request)
+        position = self.decode_cursor(request, querysets)
+        items = []
+        for kind, queryset in querysets.items():
+            if position is not None:
+                queryset = queryset.filter(
+                    self.get_position_filter(kind, position)
+                )
+            items.extend(
+                (obj.pub_date, kind, obj.pk, obj)
+                for obj in queryset.order_by(
+                    '-pub_date', '-id'
+                )[:page_size + 1]
+            )
+        items.sort(key=lambda item: item[:3], reverse=True)
+        self.has_next = len(items) > page_size
+        self.page = items[:page_size]
+        return [(kind, obj) for _, kind, _, obj in self.page]
+
+    @staticmethod
+    def get_position_filter(kind, position):
+        """
+        Условие на записи типа kind, идущие в ленте после позиции.
+        """
+        pub_date, cursor_kind, pk = position
+        earlier = Q(pub_date__lt=pub_date)
+        if kind < cursor_kind:
+            return earlier | Q(pub_date=pub_date)
+        if kind == cursor_kind:
+            return earlier | Q(pub_date=pub_date, pk__lt=pk)
+        return earlier
+
+    def decode_cursor(self, request, querysets):
+        """
+        Разбирает курсор запроса в позицию (pub_date, тип, id).
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            pub_date, kind, pk = load_cursor(encoded)
+            position = parse_datetime(pub_date), kind, int(pk)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if position[0] is None or kind not in querysets:
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data)
+        ]))
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        pub_date, kind, pk, _ = self.page[-1]
+        return replace_query_param(
+            self.base_url,
+            self.cursor_query_param,
+            dump_cursor([pub_date.isoformat(), kind, pk])
+        )
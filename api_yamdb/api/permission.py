@@ -47,6 +47,20 @@ class IsAdminModeratorAuthor(IsAuthenticatedOrReadOnly):
         модератором, автором контента, либо метод безопасен.
         """
         return (request.method in SAFE_METHODS
-                or obj.author == request.user
+                or obj.author_id == request.user.id
                 or request.user.is_moderator
                 or request.user.is_admin)
+
+
+class IsAdminOrModerator(BasePermission):
+    """
+    Предоставляет доступ только администратору и модератору.
+    """
+
+    def has_permission(self, request, view):
+        """
+        Проверяет, что пользователь является администратором
+        или модератором.
+        """
+        return (request.user.is_authenticated
+                and (request.user.is_moderator or request.user.is_admin))
@@ -1,4 +1,6 @@
 from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 from django.shortcuts import get_object_or_404
 
 from rest_framework.exceptions import ValidationError
@@ -12,18 +14,28 @@ from reviews.models import (
     Title,
     Review,
     Comment,
+    score_field
 )
 from reviews.constants import (
     MESSAGE_DUPLICATE_USERNAME,
-    MESSAGE_DUPLICATE_REVIEW,
     MESSAGE_DUPLICATE_EMAIL,
     MESSAGE_BAD_CODE,
     USERNAME_LENGTH,
     EMAIL_LENGTH,
     CODE_LENGTH,
     MIN_VALUE,
-    MAX_VALUE
+    MAX_VALUE,
+    MAX_PAGE_LIMIT,
+    TOP_TITLES_LIMIT,
+    COMMENTS_PREVIEW_LIMIT,
+    MODERATION_IDS_LIMIT,
+    MODERATION_REVIEWS,
+    MODERATION_COMMENTS,
+    MESSAGE_MODERATION_FILTER,
+    EXPORT_NDJSON,
+    EXPORT_CSV
 )
+from reviews.confirmation import consume_code
 from reviews.validators import (
     validate_year,
     validate_username
@@ -71,29 +83,52 @@ class RegistrationSerializer(serializers.ModelSerializer):
         model = User
         fields = ('email', 'username')
 
+    @staticmethod
+    def find_user(username, email):
+        """
+        Ищет пользователя с этими username и email одним запросом.
+
+        Возвращает пользователя, если совпали оба поля, None, если
+        не совпало ни одно, и ошибку, если занято только одно из них.
+        """
+        users = User.objects.filter(Q(username=username) | Q(email=email))
+        for user in users:
+            if user.username == username and user.email == email:
+                return user
+            raise ValidationError(
+                MESSAGE_DUPLICATE_USERNAME if user.username == username
+                else MESSAGE_DUPLICATE_EMAIL
+            )
+        return None
+
     def create(self, validated_data):
         """
         Создает пользователя или отправляет
         код подтверждения существующему.
+
+        Если пользователя параллельно зарегистрировал другой запрос,
+        вставка упирается в ограничение уникальности и пользователь
+        ищется повторно.
         """
-        user, _ = User.objects.get_or_create(
-            username=validated_data.get('username'),
-            email=validated_data.get('email')
-        )
-        send_code(user)
+        user = validated_data.pop('user')
+        created = user is None
+        if created:
+            try:
+                with transaction.atomic():
+                    user = User.objects.create(**validated_data)
+            except IntegrityError:
+                user = self.find_user(**validated_data)
+                if user is None:
+                    raise
+                created = False
+        send_code(user, created)
         return user
 
     def validate(self, data):
         """
         Проверяет данные перед созданием нового пользователя.
         """
-        if User.objects.filter(**data):
-            return data
-        if User.objects.filter(username=data.get('username')).exists():
-            raise ValidationError(MESSAGE_DUPLICATE_USERNAME)
-        if User.objects.filter(email=data.get('email')).exists():
-            raise ValidationError(MESSAGE_DUPLICATE_EMAIL)
-        return data
+        return {**data, 'user': self.find_user(**data)}
 
 
 class GetTokenSerializer(serializers.Serializer):
@@ -124,7 +159,7 @@ class GetTokenSerializer(serializers.Serializer):
         Валидация данных при получении токена.
         """
         user = get_object_or_404(User, username=data.get('username'))
-        if user.confirmation_code != data.get('confirmation_code'):
+        if not consume_code(user, data.get('confirmation_code')):
             raise serializers.ValidationError(MESSAGE_BAD_CODE)
         return {'user': user}
 
@@ -173,6 +208,7 @@ class GetTitleSerializer(serializers.ModelSerializer):
             'name',
             'year',
             'rating',
+            'review_count',
             'description',
             'genre',
             'category'
@@ -180,6 +216,141 @@ class GetTitleSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
+class BulkTitleSerializer(serializers.ModelSerializer):
+    """
+    Сериализатор произведения для массового создания.
+
+    Слаги категории и жанров проверяются во вьюсете
+    сразу для всего списка.
+    """
+
+    category = serializers.SlugField()
+    genre = serializers.ListField(
+        child=serializers.SlugField(),
+        allow_empty=False
+    )
+
+    class Meta:
+        model = Title
+        fields = (
+            'name',
+            'year',
+            'description',
+            'genre',
+            'category'
+        )
+
+    @staticmethod
+    def validate_year(value):
+        """
+        Проверяет, что заданный год не больше текущего.
+        """
+        return validate_year(value)
+
+
+class TopTitleSerializer(GetTitleSerializer):
+    """
+    Сериализатор произведений для рейтинга лучших.
+    """
+
+    class Meta(GetTitleSerializer.Meta):
+        fields = GetTitleSerializer.Meta.fields + ('weighted_rating',)
+        read_only_fields = fields
+
+
+class TopTitlesQuerySerializer(serializers.Serializer):
+    """
+    Сериализатор параметров запроса рейтинга лучших произведений.
+    """
+
+    category = serializers.SlugField(required=False)
+    genre = serializers.SlugField(required=False)
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=MAX_PAGE_LIMIT,
+        default=TOP_TITLES_LIMIT
+    )
+
+
+class ReviewListQuerySerializer(serializers.Serializer):
+    """
+    Сериализатор параметров запроса списка отзывов.
+    """
+
+    comments_preview = serializers.IntegerField(
+        min_value=1,
+        max_value=COMMENTS_PREVIEW_LIMIT,
+        required=False
+    )
+
+
+class ReviewExportQuerySerializer(serializers.Serializer):
+    """
+    Сериализатор параметров запроса выгрузки отзывов.
+    """
+
+    output = serializers.ChoiceField(
+        choices=(EXPORT_NDJSON, EXPORT_CSV),
+        default=EXPORT_NDJSON
+    )
+
+
+class BulkModerationSerializer(serializers.Serializer):
+    """
+    Сериализатор условий массового удаления отзывов или комментариев.
+    """
+
+    target = serializers.ChoiceField(
+        choices=(MODERATION_REVIEWS, MODERATION_COMMENTS)
+    )
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        max_length=MODERATION_IDS_LIMIT,
+        required=False
+    )
+    author = serializers.SlugRelatedField(
+        slug_field='username',
+        queryset=User.objects.all(),
+        required=False
+    )
+    since = serializers.DateTimeField(required=False)
+    until = serializers.DateTimeField(required=False)
+
+    def validate(self, data):
+        """
+        Запрещает удаление без условий, то есть всех записей сразу.
+        """
+        if not any(data.get(name) for name in
+                   ('ids', 'author', 'since', 'until')):
+            raise ValidationError(MESSAGE_MODERATION_FILTER)
+        return data
+
+
+class TitleRatingSerializer(serializers.ModelSerializer):
+    """
+    Сериализатор рейтинга и распределения оценок произведения.
+    """
+
+    rating = serializers.IntegerField(read_only=True)
+    distribution = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Title
+        fields = ('id', 'rating', 'review_count', 'distribution')
+        read_only_fields = fields
+
+    @staticmethod
+    def get_distribution(obj):
+        """
+        Возвращает количество отзывов с каждой оценкой.
+        """
+        scores = getattr(obj, 'scores', None)
+        return {
+            str(score): getattr(scores, score_field(score), 0)
+            for score in range(MIN_VALUE, MAX_VALUE + 1)
+        }
+
+
 class TitleSerializer(serializers.ModelSerializer):
     """
     Сериализатор произведений.
@@ -238,23 +409,14 @@ class ReviewSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Review
-        fields = ('id', 'text', 'author', 'score', 'pub_date')
-
-    def validate(self, data):
-        """
-        Проверяет, что пользователь не пытается
-        добавить повторный отзыв.
-        """
-        request = self.context.get('request')
-        if request.method == 'POST':
-            author = request.user
-            title_id = self.context.get('view').kwargs.get('title_id')
-            if Review.objects.filter(
-                    title_id=title_id,
-                    author=author
-            ).exists():
-                raise ValidationError(MESSAGE_DUPLICATE_REVIEW)
-        return data
+        fields = (
+            'id',
+            'text',
+            'author',
+            'score',
+            'comment_count',
+            'pub_date'
+        )
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -270,3 +432,34 @@ class CommentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Comment
         fields = ('id', 'text', 'author', 'pub_date')
+
+
+class ReviewPreviewSerializer(ReviewSerializer):
+    """
+    Сериализатор отзывов с последними комментариями.
+    """
+
+    comments_preview = CommentSerializer(many=True, read_only=True)
+
+    class Meta(ReviewSerializer.Meta):
+        fields = ReviewSerializer.Meta.fields + ('comments_preview',)
+
+
+class FeedReviewSerializer(ReviewSerializer):
+    """
+    Сериализатор отзыва в ленте пользователя.
+    """
+
+    class Meta(ReviewSerializer.Meta):
+        fields = ReviewSerializer.Meta.fields + ('title',)
+
+
+class FeedCommentSerializer(CommentSerializer):
+    """
+    Сериализатор комментария в ленте пользователя.
+    """
+
+    title = serializers.IntegerField(source='review.title_id', read_only=True)
+
+    class Meta(CommentSerializer.Meta):
+        fields = CommentSerializer.Meta.fields + ('review', 'title')
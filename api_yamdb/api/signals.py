@@ -0,0 +1,98 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from api.cache import (
+    RATINGS_SCOPE,
+    TITLES_SCOPE,
+    USERS_SCOPE,
+    bump_user_version,
+    bump_version,
+    get_comments_scope,
+    get_deleted_comments_scopes,
+    get_deleted_reviews_scopes,
+    get_reviews_scope,
+    get_title_scope
+)
+from reviews.models import Category, Comment, Genre, Title, Review, User
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_title_lists(sender, **kwargs):
+    """
+    Сбрасывает кэш списков произведений после фиксации транзакции.
+    """
+    if kwargs.get('action', 'post_').startswith('pre_'):
+        return
+    transaction.on_commit(partial(bump_version, TITLES_SCOPE))
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_reviewed_title_pages(sender, instance, **kwargs):
+    """
+    Сбрасывает кэш страниц с произведением, рейтинг которого изменился,
+    и версии его отзывов, а при удалении - и комментариев отзыва.
+    """
+    scopes = [
+        RATINGS_SCOPE,
+        get_title_scope(instance.title_id),
+        get_reviews_scope(instance.title_id)
+    ]
+    if kwargs['signal'] is post_delete:
+        scopes.append(get_comments_scope(instance.pk))
+    transaction.on_commit(partial(bump_version, *scopes))
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def bump_review_comments(sender, instance, **kwargs):
+    """
+    Меняет версию комментариев отзыва и отзывов произведения,
+    в которых выводится счётчик комментариев.
+
+    Отзыв обычно уже загружен вместе с комментарием.
+    """
+    transaction.on_commit(partial(
+        bump_version,
+        get_comments_scope(instance.review_id),
+        get_reviews_scope(instance.review.title_id)
+    ))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def bump_users(sender, instance, **kwargs):
+    """
+    Меняет версию пользователя, сбрасывая снимки его токенов,
+    а при смене никнейма - и версию отзывов и комментариев,
+    в которых он выводится.
+    """
+    transaction.on_commit(partial(bump_user_version, instance.pk))
+    if instance.username_changed:
+        transaction.on_commit(partial(bump_version, USERS_SCOPE))
+
+
+@receiver(post_delete, sender=Title)
+@receiver(post_delete, sender=User)
+def bump_deleted_children(sender, instance, **kwargs):
+    """
+    Меняет версии отзывов и комментариев, удалённых вместе
+    с произведением или пользователем, одним запросом.
+    """
+    scopes = (
+        *get_deleted_reviews_scopes(getattr(instance, 'deleted_reviews', {})),
+        *get_deleted_comments_scopes(
+            getattr(instance, 'deleted_comments', {})
+        )
+    )
+    if scopes:
+        transaction.on_commit(partial(bump_version, *scopes))
@@ -0,0 +1,117 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import Greatest
+from rest_framework.throttling import (
+    AnonRateThrottle,
+    SimpleRateThrottle,
+    UserRateThrottle
+)
+
+from reviews.constants import THROTTLE_PURGE_BATCH_SIZE
+from reviews.models import ThrottleBucket
+
+
+class SharedRateThrottle(SimpleRateThrottle):
+    """
+    Ограничение частоты запросов, общее для всех процессов.
+
+    Корзина токенов хранится в базе одной строкой: моментом, когда
+    она снова наполнится (алгоритм GCRA). Запрос, прошедший проверку,
+    стоит одного условного UPDATE по первичному ключу.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        self.now = self.timer()
+        self.interval = self.duration / self.num_requests
+        self.bucket = None
+        if self.take_token():
+            return True
+        self.bucket = self.get_bucket()
+        if self.bucket is None:
+            try:
+                with transaction.atomic():
+                    ThrottleBucket.objects.create(
+                        key=self.key, refilled_at=self.now + self.interval
+                    )
+                return True
+            except IntegrityError:
+                # Корзину параллельно создал другой запрос.
+                if self.take_token():
+                    return True
+                self.bucket = self.get_bucket()
+        return self.throttle_failure()
+
+    def take_token(self):
+        """
+        Забирает токен из корзины, если он есть.
+        """
+        now = Value(self.now, output_field=FloatField())
+        return ThrottleBucket.objects.filter(
+            key=self.key,
+            refilled_at__lte=self.now + self.duration - self.interval
+        ).update(
+            refilled_at=Greatest(F('refilled_at'), now) + self.interval
+        )
+
+    def get_bucket(self):
+        return ThrottleBucket.objects.filter(key=self.key).first()
+
+    def wait(self):
+        """
+        Возвращает число секунд до появления следующего токена.
+        """
+        if self.bucket is None:
+            return None
+        return max(
+            self.bucket.refilled_at - self.now
+            - (self.duration - self.interval),
+            0
+        )
+
+
+class AnonMinuteThrottle(SharedRateThrottle, AnonRateThrottle):
+    """
+    Поминутное ограничение для анонимных пользователей по IP.
+    """
+
+    scope = 'anon_minute'
+
+
+class UserMinuteThrottle(SharedRateThrottle, UserRateThrottle):
+    """
+    Поминутное ограничение для авторизованных пользователей.
+    """
+
+    scope = 'user_minute'
+
+    def get_cache_key(self, request, view):
+        """
+        Анонимные запросы ограничивает AnonMinuteThrottle:
+        вторая корзина на тот же IP стоила бы лишнего запроса к БД.
+        """
+        if not request.user or not request.user.is_authenticated:
+            return None
+        return super().get_cache_key(request, view)
+
+
+def purge_idle_buckets(batch_size=THROTTLE_PURGE_BATCH_SIZE):
+    """
+    Удаляет наполнившиеся корзины: они равносильны отсутствующим.
+
+    Возвращает число удалённых корзин.
+    """
+    now = SharedRateThrottle.timer()
+    purged = 0
+    while True:
+        keys = list(
+            ThrottleBucket.objects.filter(refilled_at__lt=now)
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        if not keys:
+            return purged
+        purged += ThrottleBucket.objects.filter(pk__in=keys).delete()[0]
@@ -10,6 +10,7 @@ from .views import (
     CommentViewSet,
     RegistrationView,
     GetTokenViewSet,
+    BulkModerationView,
 )
 
 router_v1 = DefaultRouter()
@@ -51,4 +52,9 @@ url_auth = [
 urlpatterns = [
     path('v1/', include(router_v1.urls)),
     path('v1/auth/', include(url_auth)),
+    path(
+        'v1/moderation/delete/',
+        BulkModerationView.as_view(),
+        name='moderation-delete'
+    ),
 ]
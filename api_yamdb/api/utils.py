@@ -1,19 +1,188 @@
-from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.conf import settings
-
-
-def send_code(user):
-    """
-    Cоздает код для учетной записи пользователя и
-    отправляет его на указанную электронную почту
-    """
-    code = default_token_generator.make_token(user)
-    user.confirmation_code = code
-    send_mail(
-        subject='Подтверждение регистрации на YaMDB',
-        message=f'Добрый день! Ваш код подтверждения: {code}',
-        from_email=settings.EMAIL_FROM,
-        recipient_list=[user.email]
-    )
-    user.save()
+import csv
+import json
+from collections import defaultdict
+from datetime import timedelta
+from functools import partial
+
+from django.db import transaction
+from django.db.models import F, Window
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+from rest_framework.fields import DateTimeField
+
+from api.cache import TITLES_SCOPE, bump_version
+from reviews.constants import (
+    EXPORT_CHUNK_SIZE,
+    EXPORT_CSV,
+    EXPORT_FLUSH_ROWS,
+    FEED_COMMENT,
+    FEED_LOOKBACK_DAYS,
+    FEED_REVIEW,
+    FEED_SOURCES_LIMIT
+)
+from reviews.confirmation import issue_code
+from reviews.models import Comment, Review, Title
+from reviews.outbox import enqueue_email
+from reviews.search import index_titles
+
+
+def send_code(user, created=False):
+    """
+    Cоздает код для учетной записи пользователя и
+    ставит письмо с ним в очередь отправки.
+    """
+    with transaction.atomic():
+        code = issue_code(user, created)
+        enqueue_email(
+            recipient=user.email,
+            subject='Подтверждение регистрации на YaMDB',
+            body=f'Добрый день! Ваш код подтверждения: {code}'
+        )
+
+
+def bulk_create_titles(items, category_ids, genre_ids):
+    """
+    Создаёт произведения и их связи с жанрами в одной транзакции.
+
+    category_ids и genre_ids сопоставляют слаги с id, поэтому
+    вставка выполняется без дополнительных запросов на каждый слаг.
+    """
+    with transaction.atomic():
+        titles = Title.objects.bulk_create([
+            Title(
+                name=item['name'],
+                year=item['year'],
+                description=item.get('description', ''),
+                category_id=category_ids[item['category']]
+            )
+            for item in items
+        ])
+        if titles and titles[0].pk is None:
+            # SQLite не возвращает id из bulk_create, но транзакция
+            # удерживает блокировку записи, и вставленные строки
+            # получают последние id подряд.
+            ids = Title.objects.order_by('-pk').values_list(
+                'pk', flat=True
+            )[:len(titles)]
+            for title, pk in zip(titles, reversed(ids)):
+                title.pk = pk
+        Title.genre.through.objects.bulk_create([
+            Title.genre.through(title_id=title.pk, genre_id=genre_ids[slug])
+            for title, item in zip(titles, items)
+            for slug in dict.fromkeys(item['genre'])
+        ])
+        index_titles(titles)
+        transaction.on_commit(partial(bump_version, TITLES_SCOPE))
+    return titles
+
+
+def get_latest_comments(review_ids, limit):
+    """
+    Возвращает по limit последних комментариев к каждому отзыву
+    одним запросом с нумерацией строк внутри отзыва.
+    """
+    ranked = Comment.objects.filter(review_id__in=review_ids).annotate(
+        row_number=Window(
+            RowNumber(),
+            partition_by=F('review_id'),
+            order_by=(F('pub_date').desc(), F('id').desc())
+        )
+    ).values('id', 'row_number')
+    sql, params = ranked.query.sql_with_params()
+    comments = Comment.objects.filter(id__in=RawSQL(
+        f'SELECT ranked.id FROM ({sql}) ranked '
+        'WHERE ranked.row_number <= %s',
+        (*params, limit)
+    )).select_related('author').order_by('pub_date', 'id')
+    latest = defaultdict(list)
+    for comment in comments:
+        latest[comment.review_id].append(comment)
+    return latest
+
+
+def get_feed_querysets(user):
+    """
+    Возвращает наборы записей ленты пользователя за FEED_LOOKBACK_DAYS:
+    чужие отзывы на произведения, которые он оценил,
+    и чужие комментарии к его отзывам.
+
+    Источниками служат только FEED_SOURCES_LIMIT последних отзывов
+    пользователя по индексу (author, pub_date), поэтому стоимость
+    ленты не растёт вместе с его историей.
+    """
+    since = timezone.now() - timedelta(days=FEED_LOOKBACK_DAYS)
+    own_reviews = Review.objects.filter(author=user).order_by(
+        '-pub_date'
+    )[:FEED_SOURCES_LIMIT]
+    return {
+        FEED_REVIEW: Review.objects.filter(
+            title__in=own_reviews.values('title'),
+            pub_date__gte=since
+        ).exclude(author=user).select_related('author'),
+        FEED_COMMENT: Comment.objects.filter(
+            review__in=own_reviews.values('pk'),
+            pub_date__gte=since
+        ).exclude(author=user).select_related('author', 'review'),
+    }
+
+
+EXPORT_COLUMNS = {
+    'id': 'id',
+    'text': 'text',
+    'author': 'author__username',
+    'score': 'score',
+    'comment_count': 'comment_count',
+    'pub_date': 'pub_date',
+}
+
+
+class EchoBuffer:
+    """
+    Буфер для csv.writer, возвращающий записанную строку.
+    """
+
+    def write(self, value):
+        return value
+
+
+def stream_reviews(title_id, output):
+    """
+    Построчно выгружает отзывы произведения в NDJSON или CSV.
+
+    Отзывы читаются из БД порциями по EXPORT_CHUNK_SIZE строк
+    и отдаются клиенту фрагментами по EXPORT_FLUSH_ROWS строк,
+    поэтому ни память, ни время до первого байта не зависят
+    от числа отзывов.
+    """
+    rows = Review.objects.filter(title_id=title_id).order_by(
+        'pub_date', 'id'
+    ).values_list(*EXPORT_COLUMNS.values()).iterator(
+        chunk_size=EXPORT_CHUNK_SIZE
+    )
+    pub_date = DateTimeField()
+    lines = []
+    if output == EXPORT_CSV:
+        writer = csv.writer(EchoBuffer())
+        lines.append(writer.writerow(EXPORT_COLUMNS))
+
+        def render(row):
+            return writer.writerow(
+                (*row[:-1], pub_date.to_representation(row[-1]))
+            )
+    else:
+        def render(row):
+            return json.dumps(
+                dict(zip(
+                    EXPORT_COLUMNS,
+                    (*row[:-1], pub_date.to_representation(row[-1]))
+                )),
+                ensure_ascii=False
+            ) + '\n'
+    for row in rows:
+        lines.append(render(row))
+        if len(lines) >= EXPORT_FLUSH_ROWS:
+            yield ''.join(lines)
+            lines = []
+    if lines:
+        yield ''.join(lines)
@@ -1,14 +1,19 @@
 from django_filters.rest_framework import DjangoFilterBackend
 from django.shortcuts import get_object_or_404
-from django.db.models import Avg
+from django.db import IntegrityError
+from django.db.models import Exists, OuterRef
+from django.http import StreamingHttpResponse
 
 from rest_framework.viewsets import ModelViewSet, GenericViewSet
 from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.filters import SearchFilter
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.relations import SlugRelatedField
 from rest_framework.views import APIView
 from rest_framework import status
+from rest_framework.settings import api_settings
 from rest_framework.permissions import (
     IsAuthenticatedOrReadOnly,
     IsAuthenticated,
@@ -28,23 +33,73 @@ from .serializers import (
     GenreSerializer,
     TitleSerializer,
     GetTitleSerializer,
+    BulkTitleSerializer,
+    TitleRatingSerializer,
+    TopTitleSerializer,
+    TopTitlesQuerySerializer,
     ReviewSerializer,
-    CommentSerializer
+    ReviewListQuerySerializer,
+    ReviewExportQuerySerializer,
+    ReviewPreviewSerializer,
+    CommentSerializer,
+    FeedReviewSerializer,
+    FeedCommentSerializer,
+    BulkModerationSerializer
+)
+from api.cache import (
+    RATINGS_SCOPE,
+    TITLES_SCOPE,
+    USERS_SCOPE,
+    bump_version,
+    get_comments_scope,
+    get_deleted_comments_scopes,
+    get_deleted_reviews_scopes,
+    get_reviews_scope,
+    get_title_scope
+)
+from api.filters import TitleFilter, UserFilter
+from api.mixins import (
+    ConditionalGetMixin,
+    NestedResourceMixin,
+    TitleListCacheMixin
+)
+from api.pagination import (
+    FeedPagination,
+    ThreadPagination,
+    TitlePagination
 )
-from api.filters import TitleFilter
 from api.permission import (
     IsAdminOrReadOnly,
     IsAdminModeratorAuthor,
+    IsAdminOrModerator,
     IsAdmin
 )
 
-from reviews.constants import ALLOW_METHODS
+from api.throttling import AnonMinuteThrottle, UserMinuteThrottle
+from api.utils import (
+    bulk_create_titles,
+    get_feed_querysets,
+    get_latest_comments,
+    stream_reviews
+)
+from reviews.constants import (
+    ALLOW_METHODS,
+    BULK_TITLES_LIMIT,
+    EXPORT_CSV,
+    FEED_COMMENT,
+    FEED_REVIEW,
+    MESSAGE_BULK_TITLES,
+    MESSAGE_DUPLICATE_REVIEW,
+    MODERATION_REVIEWS
+)
+from reviews.moderation import delete_comments, delete_reviews
 from reviews.models import (
     User,
     Category,
     Genre,
     Title,
-    Review
+    Review,
+    Comment
 )
 
 
@@ -58,9 +113,9 @@ class UserViewSet(ModelViewSet):
     http_method_names = ('get', 'post', 'delete', 'patch')
     pagination_class = LimitOffsetPagination
     permission_classes = (IsAdmin,)
-    filter_backends = (SearchFilter,)
+    filter_backends = (DjangoFilterBackend,)
+    filterset_class = UserFilter
     lookup_field = 'username'
-    search_fields = ('username',)
 
     @action(
         detail=False,
@@ -71,7 +126,7 @@ class UserViewSet(ModelViewSet):
         """
         Получить информацию о текущем пользователе.
         """
-        serializer = self.get_serializer(request.user)
+        serializer = self.get_serializer(self.get_current_user())
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     @me.mapping.patch
@@ -79,22 +134,64 @@ class UserViewSet(ModelViewSet):
         """
         Обновить информацию о текущем пользователе.
         """
+        user = self.get_current_user()
         serializer = self.get_serializer(
-            request.user,
+            user,
             data=request.data,
             partial=True,
             context={'request': request}
         )
         serializer.is_valid(raise_exception=True)
-        serializer.save(role=request.user.role)
+        serializer.save(role=user.role)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    def get_current_user(self):
+        """
+        Возвращает текущего пользователя со всеми полями: после
+        аутентификации по запомненному токену в request.user есть
+        только поля, нужные для проверки прав.
+        """
+        user = self.request.user
+        if not user.get_deferred_fields():
+            return user
+        return User.objects.get(pk=user.pk)
+
+    @action(
+        detail=False,
+        methods=['GET'],
+        url_path='me/feed',
+        permission_classes=(IsAuthenticated,)
+    )
+    def feed(self, request):
+        """
+        Получить ленту новых отзывов на оценённые произведения
+        и комментариев к отзывам текущего пользователя.
+        """
+        serializers = {
+            FEED_REVIEW: FeedReviewSerializer,
+            FEED_COMMENT: FeedCommentSerializer
+        }
+        paginator = FeedPagination()
+        page = paginator.paginate_feed(
+            get_feed_querysets(request.user), request
+        )
+        return paginator.get_paginated_response([
+            {'type': kind, **serializers[kind](obj).data}
+            for kind, obj in page
+        ])
+
 
 class RegistrationView(APIView):
     """
     Вьюсет для запроса на регистрацию пользователя.
     """
 
+    throttle_classes = (
+        *api_settings.DEFAULT_THROTTLE_CLASSES,
+        AnonMinuteThrottle,
+        UserMinuteThrottle,
+    )
+
     def post(self, request):
         """
         Обработка POST-запроса для создания нового пользователя.
@@ -113,6 +210,8 @@ class GetTokenViewSet(APIView):
     Вьюсет для запроса на получение токена.
     """
 
+    throttle_classes = RegistrationView.throttle_classes
+
     def post(self, request):
         """
         Обработка POST-запроса для получения токена доступа.
@@ -161,20 +260,138 @@ class GenreViewSet(BaseViewSet):
     serializer_class = GenreSerializer
 
 
-class TitleViewSet(ModelViewSet):
+class TitleViewSet(ConditionalGetMixin, TitleListCacheMixin, ModelViewSet):
     """
     Вьюсет для модели произведений.
     """
 
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')
-    ).order_by('-year')
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genre').order_by('-year', '-id')
     http_method_names = ALLOW_METHODS
     permission_classes = (IsAdminOrReadOnly,)
-    pagination_class = LimitOffsetPagination
+    pagination_class = TitlePagination
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
 
+    def get_version_scopes(self):
+        """
+        Список зависит от всех произведений и рейтингов,
+        объект - от справочников и своего рейтинга.
+        """
+        if self.action == 'list':
+            return (TITLES_SCOPE, RATINGS_SCOPE)
+        return (TITLES_SCOPE, get_title_scope(self.kwargs['pk']))
+
+    def get_extra_version_scopes(self):
+        """
+        Версии произведений страницы из кэша сверяются тем же
+        запросом, что и версии ETag.
+        """
+        return self.get_cached_page_scopes()
+
+    @action(detail=False, methods=['POST'])
+    def bulk(self, request):
+        """
+        Создать список произведений; ошибочные элементы пропускаются.
+        """
+        if (not isinstance(request.data, list) or not request.data
+                or len(request.data) > BULK_TITLES_LIMIT):
+            raise ValidationError(MESSAGE_BULK_TITLES)
+        items, errors = {}, {}
+        for index, item in enumerate(request.data):
+            serializer = BulkTitleSerializer(data=item)
+            if serializer.is_valid():
+                items[index] = serializer.validated_data
+            else:
+                errors[index] = serializer.errors
+        category_ids = dict(Category.objects.filter(
+            slug__in={item['category'] for item in items.values()}
+        ).values_list('slug', 'pk'))
+        genre_ids = dict(Genre.objects.filter(
+            slug__in={slug for item in items.values()
+                      for slug in item['genre']}
+        ).values_list('slug', 'pk'))
+        message = SlugRelatedField.default_error_messages['does_not_exist']
+        for index, item in list(items.items()):
+            item_errors = {}
+            if item['category'] not in category_ids:
+                item_errors['category'] = [
+                    message.format(slug_name='slug', value=item['category'])
+                ]
+            missing = [slug for slug in item['genre']
+                       if slug not in genre_ids]
+            if missing:
+                item_errors['genre'] = [
+                    message.format(slug_name='slug', value=slug)
+                    for slug in missing
+                ]
+            if item_errors:
+                errors[index] = item_errors
+                del items[index]
+        titles = bulk_create_titles(
+            list(items.values()), category_ids, genre_ids
+        )
+        created = {
+            title.pk: title for title in self.get_queryset().filter(
+                pk__in=[title.pk for title in titles]
+            )
+        }
+        return Response(
+            {
+                'created': GetTitleSerializer(
+                    [created[title.pk] for title in titles], many=True
+                ).data,
+                'errors': [
+                    {'index': index, 'errors': errors[index]}
+                    for index in sorted(errors)
+                ]
+            },
+            status=(status.HTTP_201_CREATED if titles
+                    else status.HTTP_400_BAD_REQUEST)
+        )
+
+    @action(detail=False, methods=['GET'])
+    def top(self, request):
+        """
+        Получить лучшие произведения по взвешенному рейтингу.
+        """
+        params = TopTitlesQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        titles = self.get_queryset()
+        category = params.validated_data.get('category')
+        if category:
+            titles = titles.filter(category__slug=category)
+        genre = params.validated_data.get('genre')
+        if genre:
+            titles = titles.filter(Exists(
+                Title.genre.through.objects.filter(
+                    title_id=OuterRef('pk'),
+                    genre__slug=genre
+                )
+            ))
+        titles = titles.order_by(
+            '-weighted_rating', '-id'
+        )[:params.validated_data['limit']]
+        return Response(
+            TopTitleSerializer(titles, many=True).data,
+            status=status.HTTP_200_OK
+        )
+
+    @action(detail=True, methods=['GET'])
+    def rating(self, request, pk=None):
+        """
+        Получить рейтинг и распределение оценок произведения.
+        """
+        title = get_object_or_404(
+            Title.objects.select_related('scores'),
+            pk=pk
+        )
+        return Response(
+            TitleRatingSerializer(title).data,
+            status=status.HTTP_200_OK
+        )
+
     def get_serializer_class(self):
         """
         Определяет класс сериализатора для текущего запроса.
@@ -184,7 +401,7 @@ class TitleViewSet(ModelViewSet):
         return TitleSerializer
 
 
-class ReviewViewSet(ModelViewSet):
+class ReviewViewSet(ConditionalGetMixin, NestedResourceMixin, ModelViewSet):
     """
     Вьюсет для модели отзывов.
     """
@@ -195,33 +412,140 @@ class ReviewViewSet(ModelViewSet):
         IsAuthenticatedOrReadOnly,
         IsAdminModeratorAuthor
     ]
+    pagination_class = ThreadPagination
+    parent_queryset = Title.objects.all()
+    parent_lookups = {'pk': 'title_id'}
+
+    def get_version_scopes(self):
+        """
+        Отзывы зависят от своего произведения и имён авторов.
+        """
+        return (USERS_SCOPE, get_reviews_scope(self.kwargs.get('title_id')))
 
     def get_title(self):
         """
         Возвращает объект произведения через 'title_id' в URL.
         """
-        return get_object_or_404(
-            Title,
-            pk=self.kwargs.get('title_id')
-        )
+        return self.get_parent()
+
+    def get_comments_preview(self):
+        """
+        Возвращает число последних комментариев для встраивания
+        в список отзывов или None, если они не запрошены.
+        """
+        if self.action != 'list':
+            return None
+        params = ReviewListQuerySerializer(data=self.request.query_params)
+        params.is_valid(raise_exception=True)
+        return params.validated_data.get('comments_preview')
+
+    def get_serializer_class(self):
+        """
+        Добавляет последние комментарии, если они запрошены.
+        """
+        if self.get_comments_preview():
+            return ReviewPreviewSerializer
+        return ReviewSerializer
+
+    def paginate_queryset(self, queryset):
+        """
+        Загружает последние комментарии отзывов страницы одним запросом.
+        """
+        page = super().paginate_queryset(queryset)
+        limit = self.get_comments_preview()
+        if limit and page is not None:
+            latest = get_latest_comments([review.pk for review in page], limit)
+            for review in page:
+                review.comments_preview = latest[review.pk]
+        return page
 
     def get_queryset(self):
         """
         Получает набор отзывов для конкретного произведения.
+
+        Отдельный отзыв ищется сразу с условием на произведение,
+        без предварительного запроса к нему.
         """
-        return self.get_title().reviews.select_related('author')
+        if self.action == 'list':
+            return self.get_title().reviews.select_related('author')
+        return Review.objects.filter(
+            **self.get_parent_filters('title__')
+        ).select_related('author')
 
     def perform_create(self, serializer):
         """
         Создает новый отзыв для указанного произведения.
+
+        Повторный отзыв отсекается ограничением уникальности в БД,
+        а не предварительной проверкой, которую обходят
+        параллельные запросы.
         """
-        serializer.save(
-            author=self.request.user,
-            title=self.get_title()
+        title = self.get_title()
+        try:
+            serializer.save(author=self.request.user, title=title)
+        except IntegrityError:
+            if not title.reviews.filter(author=self.request.user).exists():
+                raise
+            raise ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: [MESSAGE_DUPLICATE_REVIEW]}
+            )
+
+    @action(
+        detail=False,
+        methods=['PUT'],
+        url_path='me',
+        http_method_names=ALLOW_METHODS + ('put',)
+    )
+    def put_me(self, request, title_id=None):
+        """
+        Создать или заменить отзыв текущего пользователя.
+        """
+        title = self.get_title()
+        review = title.reviews.filter(author=request.user).first()
+        created = review is None
+        serializer = self.get_serializer(review, data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            serializer.save(author=request.user, title=title)
+        except IntegrityError:
+            # Отзыв успел создать параллельный запрос - заменяем его.
+            serializer = self.get_serializer(
+                title.reviews.get(author=request.user),
+                data=request.data
+            )
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+            created = False
+        return Response(
+            serializer.data,
+            status=(status.HTTP_201_CREATED if created
+                    else status.HTTP_200_OK)
+        )
+
+    @action(detail=False, methods=['GET'])
+    def export(self, request, title_id=None):
+        """
+        Выгрузить все отзывы произведения потоком NDJSON или CSV.
+
+        Формат задаётся параметром output, а не format,
+        который DRF использует для выбора рендерера.
+        """
+        params = ReviewExportQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        output = params.validated_data['output']
+        title = self.get_title()
+        response = StreamingHttpResponse(
+            stream_reviews(title.pk, output),
+            content_type=('text/csv; charset=utf-8' if output == EXPORT_CSV
+                          else 'application/x-ndjson')
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="title-{title.pk}-reviews.{output}"'
         )
+        return response
 
 
-class CommentViewSet(ModelViewSet):
+class CommentViewSet(ConditionalGetMixin, NestedResourceMixin, ModelViewSet):
     """
     Вьюсет для модели Комментариев.
     """
@@ -232,21 +556,38 @@ class CommentViewSet(ModelViewSet):
         IsAuthenticatedOrReadOnly,
         IsAdminModeratorAuthor
     ]
+    pagination_class = ThreadPagination
+    parent_queryset = Review.objects.select_related('title')
+    parent_lookups = {'pk': 'review_id', 'title_id': 'title_id'}
 
-    def get_review(self):
+    def get_version_scopes(self):
         """
-        Возвращает объект отзыва через 'review_id' в URL.
+        Комментарии зависят от своего отзыва и имён авторов.
         """
-        return get_object_or_404(
-            Review,
-            pk=self.kwargs.get('review_id')
+        return (
+            USERS_SCOPE,
+            get_comments_scope(self.kwargs.get('review_id'))
         )
 
+    def get_review(self):
+        """
+        Возвращает объект отзыва через 'review_id' в URL,
+        проверяя, что он относится к произведению 'title_id'.
+        """
+        return self.get_parent()
+
     def get_queryset(self):
         """
         Получает набор комментариев для конкретного отзыва.
+
+        Отдельный комментарий ищется сразу с условием на всю цепочку
+        и загружается вместе с отзывом, уже присоединённым условием.
         """
-        return self.get_review().comments.select_related('author')
+        if self.action == 'list':
+            return self.get_review().comments.select_related('author')
+        return Comment.objects.filter(
+            **self.get_parent_filters('review__')
+        ).select_related('author', 'review')
 
     def perform_create(self, serializer):
         """
@@ -256,3 +597,40 @@ class CommentViewSet(ModelViewSet):
             author=self.request.user,
             review=self.get_review()
         )
+
+
+class BulkModerationView(APIView):
+    """
+    Вьюсет для массового удаления отзывов или комментариев модератором.
+    """
+
+    permission_classes = (IsAdminOrModerator,)
+
+    def post(self, request):
+        """
+        Удаляет отзывы или комментарии по списку id, автору
+        и периоду публикации в одной транзакции.
+        """
+        serializer = BulkModerationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        model = (Review if data['target'] == MODERATION_REVIEWS
+                 else Comment)
+        queryset = model.objects.all()
+        if data.get('ids'):
+            queryset = queryset.filter(pk__in=data['ids'])
+        if 'author' in data:
+            queryset = queryset.filter(author=data['author'])
+        if 'since' in data:
+            queryset = queryset.filter(pub_date__gte=data['since'])
+        if 'until' in data:
+            queryset = queryset.filter(pub_date__lte=data['until'])
+        if model is Review:
+            reviews = delete_reviews(queryset)
+            bump_version(*get_deleted_reviews_scopes(reviews))
+            deleted = len(reviews)
+        else:
+            comment_ids, reviews = delete_comments(queryset)
+            bump_version(*get_deleted_comments_scopes(reviews))
+            deleted = len(comment_ids)
+        return Response({'deleted': deleted}, status=status.HTTP_200_OK)
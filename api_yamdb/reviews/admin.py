@@ -8,7 +8,8 @@ from .models import (
     Genre,
     Title,
     Review,
-    Comment
+    Comment,
+    EmailOutbox
 )
 
 admin.site.empty_value_display = 'Не задано'
@@ -115,3 +116,21 @@ class CommentAdmin(admin.ModelAdmin):
     )
     search_fields = ('text',)
     list_filter = ('author', 'review', 'pub_date',)
+
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    """
+    Настройка раздела очереди исходящих писем.
+    """
+
+    list_display = (
+        'recipient',
+        'subject',
+        'created_at',
+        'attempts',
+        'send_after',
+        'sent_at',
+    )
+    search_fields = ('recipient',)
+    list_filter = ('sent_at', 'attempts',)
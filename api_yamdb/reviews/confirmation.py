@@ -0,0 +1,95 @@
+import secrets
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.crypto import salted_hmac
+
+from reviews.constants import (
+    CODE_LENGTH,
+    CODE_LIFETIME_MINUTES,
+    CODE_MAX_ATTEMPTS,
+    CODE_PURGE_BATCH_SIZE
+)
+from reviews.models import ConfirmationCode
+
+
+def get_code_digest(user_id, code):
+    """
+    Возвращает HMAC кода, привязанный к пользователю и SECRET_KEY.
+    """
+    return salted_hmac(
+        'reviews.ConfirmationCode',
+        f'{user_id}:{code}',
+        algorithm='sha256'
+    ).hexdigest()
+
+
+def issue_code(user, created=False):
+    """
+    Создаёт новый код подтверждения, заменяя прежний код пользователя.
+
+    Для существующего пользователя это обычно один UPDATE,
+    для только что созданного - одна вставка.
+    """
+    code = f'{secrets.randbelow(10 ** CODE_LENGTH):0{CODE_LENGTH}d}'
+    values = {
+        'digest': get_code_digest(user.pk, code),
+        'expires_at': (
+            timezone.now() + timedelta(minutes=CODE_LIFETIME_MINUTES)
+        ),
+        'attempts': 0,
+    }
+    codes = ConfirmationCode.objects.filter(user_id=user.pk)
+    if not created and codes.update(**values):
+        return code
+    try:
+        with transaction.atomic():
+            ConfirmationCode.objects.create(user_id=user.pk, **values)
+    except IntegrityError:
+        # Код параллельно выдал другой запрос - заменяем его.
+        codes.update(**values)
+    return code
+
+
+def consume_code(user, code):
+    """
+    Погашает код, если он действует, одним удалением по индексу HMAC.
+
+    Удаление условное, поэтому код нельзя использовать дважды
+    даже параллельными запросами. Неверный код увеличивает счётчик
+    попыток условным UPDATE, а последняя допустимая попытка
+    удаляет код, чтобы его нельзя было подобрать.
+    """
+    deleted, _ = ConfirmationCode.objects.filter(
+        digest=get_code_digest(user.pk, code),
+        user_id=user.pk,
+        expires_at__gt=timezone.now()
+    ).delete()
+    if deleted:
+        return True
+    codes = ConfirmationCode.objects.filter(user_id=user.pk)
+    if not codes.filter(attempts__lt=CODE_MAX_ATTEMPTS - 1).update(
+        attempts=F('attempts') + 1
+    ):
+        codes.delete()
+    return False
+
+
+def purge_expired_codes(batch_size=CODE_PURGE_BATCH_SIZE):
+    """
+    Удаляет истёкшие коды пачками, не блокируя таблицу надолго.
+
+    Возвращает число удалённых кодов.
+    """
+    now = timezone.now()
+    purged = 0
+    while True:
+        ids = list(
+            ConfirmationCode.objects.filter(expires_at__lte=now)
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        if not ids:
+            return purged
+        purged += ConfirmationCode.objects.filter(pk__in=ids).delete()[0]
@@ -1,6 +1,10 @@
 USERNAME_LENGTH = 150
 EMAIL_LENGTH = 254
-CODE_LENGTH = 254
+CODE_LENGTH = 6
+CODE_DIGEST_LENGTH = 64
+CODE_LIFETIME_MINUTES = 60
+CODE_MAX_ATTEMPTS = 5
+CODE_PURGE_BATCH_SIZE = 1000
 
 SYMBOLS_LENGTH = 20
 GENRE_LENGTH = 256
@@ -10,6 +14,53 @@ SLUG_LENGTH = 50
 MAX_VALUE = 10
 MIN_VALUE = 1
 
+RATING_PRIOR_MEAN = (MIN_VALUE + MAX_VALUE) / 2
+RATING_PRIOR_WEIGHT = 10
+
+# Ограничение SQLite на число параметров запроса - 999.
+QUERY_BATCH_SIZE = 500
+
+MAX_PAGE_LIMIT = 100
+TOP_TITLES_LIMIT = 10
+BULK_TITLES_LIMIT = 1000
+COMMENTS_PREVIEW_LIMIT = 10
+FEED_LOOKBACK_DAYS = 30
+FEED_SOURCES_LIMIT = 500
+FEED_REVIEW = 'review'
+FEED_COMMENT = 'comment'
+MODERATION_IDS_LIMIT = 500
+MODERATION_REVIEWS = 'reviews'
+MODERATION_COMMENTS = 'comments'
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FLUSH_ROWS = 100
+EXPORT_NDJSON = 'ndjson'
+EXPORT_CSV = 'csv'
+
+TITLE_LIST_CACHE_TIMEOUT = 60 * 5
+CACHE_SCOPE_LENGTH = 64
+CACHE_VERSION_LENGTH = 64
+AUTH_USER_CACHE_SIZE = 10000
+AUTH_USER_CACHE_TIMEOUT = 60
+# Версия пользователя живёт дольше снимков, которые с ней сверяются.
+USER_VERSION_TIMEOUT = AUTH_USER_CACHE_TIMEOUT * 2
+
+OUTBOX_BATCH_SIZE = 100
+OUTBOX_LEASE_SECONDS = 60 * 5
+OUTBOX_RETRY_SECONDS = 60
+OUTBOX_RETRY_MAX_SECONDS = 60 * 60
+OUTBOX_MAX_ATTEMPTS = 8
+OUTBOX_SUBJECT_LENGTH = 255
+
+THROTTLE_KEY_LENGTH = 128
+THROTTLE_PURGE_BATCH_SIZE = 1000
+
+GENRE_MATCH_ANY = 'any'
+GENRE_MATCH_ALL = 'all'
+
+USER_SEARCH_EXACT = 'exact'
+USER_SEARCH_PREFIX = 'prefix'
+USER_SEARCH_CONTAINS = 'contains'
+
 ROLE_USER = 'user'
 ROLE_MODERATOR = 'moderator'
 ROLE_ADMIN = 'admin'
@@ -51,3 +102,9 @@ MESSAGE_DUPLICATE_USERNAME = ('Пользователь с таким имене
 MESSAGE_DUPLICATE_EMAIL = ('Пользователь с таким адресом '
                            'электронной почты уже существует.')
 MESSAGE_BAD_CODE = 'Неверный код подтверждения!'
+MESSAGE_MODERATION_FILTER = ('Укажите хотя бы одно условие: '
+                             'ids, author, since или until.')
+MESSAGE_BULK_TITLES = (f'Ожидается непустой список не более чем '
+                       f'из {BULK_TITLES_LIMIT} произведений.')
+MESSAGE_SEARCH_CURSOR = ('Результаты поиска упорядочены по релевантности '
+                         'и листаются через limit и offset, а не cursor.')
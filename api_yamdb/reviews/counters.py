@@ -0,0 +1,200 @@
+from django.db.models import (
+    Count,
+    ExpressionWrapper,
+    F,
+    FloatField,
+    OuterRef,
+    Subquery,
+    Sum
+)
+from django.db.models.functions import Cast, Coalesce
+
+from reviews.constants import (
+    MIN_VALUE,
+    MAX_VALUE,
+    RATING_PRIOR_MEAN,
+    RATING_PRIOR_WEIGHT
+)
+from reviews.models import (
+    Comment,
+    ScoreDistribution,
+    Title,
+    Review,
+    score_field
+)
+
+SCORES = range(MIN_VALUE, MAX_VALUE + 1)
+
+
+def weighted_rating(score_sum, review_count):
+    """
+    Байесовский рейтинг: средняя оценка, сглаженная к априорной
+    RATING_PRIOR_MEAN с весом RATING_PRIOR_WEIGHT отзывов.
+    """
+    return ExpressionWrapper(
+        (Cast(score_sum, FloatField())
+         + RATING_PRIOR_WEIGHT * RATING_PRIOR_MEAN)
+        / (Cast(review_count, FloatField()) + RATING_PRIOR_WEIGHT),
+        output_field=FloatField()
+    )
+
+
+def apply_review_change(title_id, old_score=None, new_score=None):
+    """
+    Атомарно переносит оценку отзыва в счётчиках произведения.
+
+    old_score - оценка до изменения (None для нового отзыва),
+    new_score - оценка после изменения (None для удалённого отзыва).
+    """
+    score_sum = F('score_sum') + (new_score or 0) - (old_score or 0)
+    review_count = (F('review_count') + (new_score is not None)
+                    - (old_score is not None))
+    Title.objects.filter(pk=title_id).update(
+        score_sum=score_sum,
+        review_count=review_count,
+        weighted_rating=weighted_rating(score_sum, review_count)
+    )
+    changes = {}
+    if old_score is not None:
+        changes[score_field(old_score)] = F(score_field(old_score)) - 1
+    if new_score is not None:
+        changes[score_field(new_score)] = F(score_field(new_score)) + 1
+    distribution = ScoreDistribution.objects.filter(title_id=title_id)
+    if distribution.update(**changes) or new_score is None:
+        return
+    ScoreDistribution.objects.get_or_create(title_id=title_id)
+    distribution.update(**changes)
+
+
+def apply_comment_change(review_id, delta):
+    """
+    Атомарно изменяет счётчик комментариев отзыва на delta.
+    """
+    Review.objects.filter(pk=review_id).update(
+        comment_count=F('comment_count') + delta
+    )
+
+
+def count_reviews(title_ref, **filters):
+    """
+    Подзапрос количества отзывов на произведение.
+    """
+    return Coalesce(
+        Subquery(
+            Review.objects.filter(title=title_ref, **filters).order_by(
+            ).values('title').annotate(total=Count('pk')).values('total')
+        ),
+        0
+    )
+
+
+def sum_scores(title_ref):
+    """
+    Подзапрос суммы оценок произведения.
+    """
+    return Coalesce(
+        Subquery(
+            Review.objects.filter(title=title_ref).order_by(
+            ).values('title').annotate(total=Sum('score')).values('total')
+        ),
+        0
+    )
+
+
+def count_comments(review_ref):
+    """
+    Подзапрос количества комментариев к отзыву.
+    """
+    return Coalesce(
+        Subquery(
+            Comment.objects.filter(review=review_ref).order_by(
+            ).values('review').annotate(total=Count('pk')).values('total')
+        ),
+        0
+    )
+
+
+def rebuild_title_counters(queryset=None):
+    """
+    Пересчитывает счётчики и распределения оценок произведений
+    set-based запросами по отзывам.
+    """
+    if queryset is None:
+        queryset = Title.objects.all()
+    updated = queryset.update(
+        score_sum=sum_scores(OuterRef('pk')),
+        review_count=count_reviews(OuterRef('pk'))
+    )
+    queryset.update(
+        weighted_rating=weighted_rating(F('score_sum'), F('review_count'))
+    )
+    ScoreDistribution.objects.bulk_create(
+        [
+            ScoreDistribution(title_id=title_id)
+            for title_id in queryset.filter(
+                scores__isnull=True
+            ).values_list('pk', flat=True)
+        ],
+        ignore_conflicts=True
+    )
+    ScoreDistribution.objects.filter(title__in=queryset.values('pk')).update(
+        **{
+            score_field(score): count_reviews(OuterRef('title'), score=score)
+            for score in SCORES
+        }
+    )
+    return updated
+
+
+def find_title_counter_drift(queryset=None):
+    """
+    Возвращает произведения, счётчики которых разошлись с отзывами.
+    """
+    if queryset is None:
+        queryset = Title.objects.all()
+    fields = {
+        'actual_sum': ('score_sum', sum_scores(OuterRef('pk'))),
+        'actual_count': ('review_count', count_reviews(OuterRef('pk'))),
+        'actual_weighted_rating': (
+            'weighted_rating',
+            weighted_rating(
+                sum_scores(OuterRef('pk')), count_reviews(OuterRef('pk'))
+            )
+        )
+    }
+    for score in SCORES:
+        fields[f'actual_{score_field(score)}'] = (
+            f'stored_{score_field(score)}',
+            count_reviews(OuterRef('pk'), score=score)
+        )
+    return queryset.annotate(
+        **{
+            f'stored_{score_field(score)}': Coalesce(
+                f'scores__{score_field(score)}', 0
+            )
+            for score in SCORES
+        },
+        **{name: actual for name, (_, actual) in fields.items()}
+    ).exclude(
+        **{stored: F(name) for name, (stored, _) in fields.items()}
+    )
+
+
+def rebuild_review_counters(queryset=None):
+    """
+    Пересчитывает счётчики комментариев отзывов одним запросом.
+    """
+    if queryset is None:
+        queryset = Review.objects.all()
+    return queryset.update(comment_count=count_comments(OuterRef('pk')))
+
+
+def find_review_counter_drift(queryset=None):
+    """
+    Возвращает отзывы, счётчик комментариев которых разошёлся с данными.
+    """
+    if queryset is None:
+        queryset = Review.objects.all()
+    return queryset.annotate(
+        actual_comment_count=count_comments(OuterRef('pk'))
+    ).exclude(comment_count=F('actual_comment_count'))
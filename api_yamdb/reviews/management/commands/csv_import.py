@@ -5,10 +5,8 @@ from django.core.management.base import (
     CommandError
 )
 
-
-from users.models import User
-
-from reviews.costants import (
+from api.cache import bump_all_versions
+from reviews.constants import (
     PATH,
     UTF,
     USERS,
@@ -18,12 +16,18 @@ from reviews.costants import (
     REVIEW,
     COMMENTS
 )
+from reviews.counters import (
+    rebuild_review_counters,
+    rebuild_title_counters
+)
+from reviews.search import rebuild_title_index
 from reviews.models import (
     Category,
     Genre,
     Title,
     Review,
-    Comment
+    Comment,
+    User
 )
 
 
@@ -39,12 +43,16 @@ class Command(BaseCommand):
     def import_users():
         """
         Импорт пользователей из CSV-файла в базу данных.
+
+        bulk_create не вызывает User.save(), поэтому никнейм
+        для поиска заполняется здесь.
         """
         with open(f'{PATH}{USERS}', 'r', encoding=UTF) as file_csv:
             objs = [
                 User(
                     id=row['id'],
                     username=row['username'],
+                    username_folded=row['username'].casefold(),
                     email=row['email'],
                     role=row['role'],
                     bio=row['bio'],
@@ -152,6 +160,10 @@ class Command(BaseCommand):
             self.import_titles()
             self.import_review()
             self.import_comments()
+            rebuild_title_counters()
+            rebuild_review_counters()
+            rebuild_title_index()
+            bump_all_versions()
         except Exception as error:
             raise CommandError(f'Невозможно открыть файл: {error}')
         self.stdout.write(
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from reviews.confirmation import purge_expired_codes
+from reviews.constants import CODE_PURGE_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    """
+    Команда для удаления истёкших кодов подтверждения.
+    """
+
+    help = ('Удаление истёкших кодов подтверждения пачками: '
+            'python manage.py purge_confirmation_codes')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=CODE_PURGE_BATCH_SIZE,
+            help='Количество кодов, удаляемых одним запросом.'
+        )
+
+    def handle(self, *args, **options):
+        """
+        Удаляет истёкшие коды и выводит их количество.
+        """
+        purged = purge_expired_codes(options['batch_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Удалено истёкших кодов: {purged}.')
+        )
@@ -0,0 +1,58 @@
+from django.core.management.base import (
+    BaseCommand,
+    CommandError
+)
+from django.db import transaction
+
+from api.cache import bump_all_versions
+from reviews.counters import (
+    find_review_counter_drift,
+    find_title_counter_drift,
+    rebuild_review_counters,
+    rebuild_title_counters
+)
+
+
+class Command(BaseCommand):
+    """
+    Команда для пересчёта и проверки счётчиков произведений и отзывов.
+    """
+
+    help = ('Пересчёт счётчиков рейтинга произведений по отзывам '
+            'и счётчиков комментариев отзывов: '
+            'python manage.py rebuild_counters [--check]')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только проверить счётчики, не изменяя их.'
+        )
+
+    def handle(self, *args, **options):
+        """
+        Находит расхождения и при необходимости пересчитывает счётчики.
+        """
+        drift = find_title_counter_drift().count()
+        review_drift = find_review_counter_drift().count()
+        if options['check']:
+            if drift or review_drift:
+                raise CommandError(
+                    f'Счётчики расходятся с данными у {drift} '
+                    f'произведений и {review_drift} отзывов.'
+                )
+            self.stdout.write(
+                self.style.SUCCESS('Счётчики корректны.')
+            )
+            return
+        with transaction.atomic():
+            updated = rebuild_title_counters()
+            reviews_updated = rebuild_review_counters()
+        # Счётчики изменены в обход сигналов: сбрасываем кэш и ETag.
+        bump_all_versions()
+        self.stdout.write(
+            self.style.SUCCESS(f'Пересчитаны счётчики {updated} '
+                               f'произведений и {reviews_updated} отзывов, '
+                               f'исправлено расхождений: '
+                               f'{drift + review_drift}.')
+        )
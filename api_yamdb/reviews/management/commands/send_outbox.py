@@ -0,0 +1,54 @@
+from time import sleep
+
+from django.core.management.base import BaseCommand
+
+from reviews.constants import OUTBOX_BATCH_SIZE
+from reviews.outbox import send_outbox
+
+
+class Command(BaseCommand):
+    """
+    Команда для отправки писем из очереди.
+    """
+
+    help = ('Отправка писем из очереди пачками через одно соединение: '
+            'python manage.py send_outbox [--loop]')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=OUTBOX_BATCH_SIZE,
+            help='Количество писем, отправляемых через одно соединение.'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Работать постоянно, проверяя очередь с интервалом.'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Интервал проверки очереди в секундах для --loop.'
+        )
+
+    def handle(self, *args, **options):
+        """
+        Отправляет все письма, срок отправки которых наступил.
+        """
+        while True:
+            sent = failed = 0
+            while True:
+                batch_sent, batch_failed = send_outbox(options['batch_size'])
+                if not batch_sent + batch_failed:
+                    break
+                sent += batch_sent
+                failed += batch_failed
+            if sent or failed or not options['loop']:
+                self.stdout.write(
+                    f'Отправлено писем: {sent}, отложено: {failed}.'
+                )
+            if not options['loop']:
+                return
+            sleep(options['interval'])
@@ -0,0 +1,18 @@
+# Generated by Django 3.2 on 2026-10-18 16:53
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_title_fts_index'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            'CREATE INDEX title_genre_genre_title_idx '
+            'ON reviews_title_genre (genre_id, title_id)',
+            'DROP INDEX title_genre_genre_title_idx'
+        ),
+    ]
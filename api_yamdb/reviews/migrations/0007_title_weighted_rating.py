@@ -0,0 +1,38 @@
+# Generated by Django 3.2 on 2026-10-18 16:55
+
+from django.db import migrations, models
+from django.db.models import ExpressionWrapper, F, FloatField
+from django.db.models.functions import Cast
+
+
+def fill_weighted_rating(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Title.objects.update(weighted_rating=ExpressionWrapper(
+        (Cast(F('score_sum'), FloatField()) + 10 * 5.5)
+        / (Cast(F('review_count'), FloatField()) + 10),
+        output_field=FloatField()
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_score_distribution'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='weighted_rating',
+            field=models.FloatField(default=5.5, editable=False, verbose_name='Взвешенный рейтинг'),
+        ),
+        migrations.RunPython(fill_weighted_rating, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['weighted_rating', 'id'], name='title_weighted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['category', 'weighted_rating'], name='title_category_weighted_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 3.2 on 2026-10-18 17:40
+
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def fill_username_folded(apps, schema_editor):
+    User = apps.get_model('reviews', 'User')
+    batch = []
+    for user in User.objects.only('username').iterator(chunk_size=BATCH_SIZE):
+        user.username_folded = user.username.casefold()
+        batch.append(user)
+        if len(batch) == BATCH_SIZE:
+            User.objects.bulk_update(batch, ['username_folded'])
+            batch = []
+    User.objects.bulk_update(batch, ['username_folded'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0012_confirmation_codes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='username_folded',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=150, verbose_name='Никнейм без учёта регистра'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_username_folded, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 3.2 on 2026-10-18 17:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0013_user_username_folded'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ThrottleBucket',
+            fields=[
+                ('key', models.CharField(max_length=128, primary_key=True, serialize=False, verbose_name='Ключ')),
+                ('refilled_at', models.FloatField(verbose_name='Полностью восстановится')),
+            ],
+            options={
+                'verbose_name': 'Ограничение частоты запросов',
+                'verbose_name_plural': 'Ограничения частоты запросов',
+            },
+        ),
+    ]
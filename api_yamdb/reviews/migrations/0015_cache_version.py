@@ -0,0 +1,24 @@
+# Generated by Django 3.2 on 2026-10-18 17:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0014_throttle_bucket'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CacheVersion',
+            fields=[
+                ('scope', models.CharField(max_length=64, primary_key=True, serialize=False, verbose_name='Область')),
+                ('version', models.CharField(max_length=64, verbose_name='Версия')),
+            ],
+            options={
+                'verbose_name': 'Версия области кэша',
+                'verbose_name_plural': 'Версии областей кэша',
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2 on 2026-10-18 18:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0015_cache_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='confirmationcode',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0, verbose_name='Неудачные попытки'),
+        ),
+    ]
@@ -3,7 +3,9 @@ from django.core.validators import (
     MinValueValidator,
     MaxValueValidator
 )
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Q
+from django.utils import timezone
 
 from reviews.constants import (
     MESSAGE_MIN_VALUE,
@@ -14,12 +16,17 @@ from reviews.constants import (
     EMAIL_LENGTH,
     GENRE_LENGTH,
     TITLE_LENGTH,
-    CODE_LENGTH,
+    CODE_DIGEST_LENGTH,
     SLUG_LENGTH,
     ROLE_ADMIN,
     ROLE_USER,
     MIN_VALUE,
-    MAX_VALUE
+    MAX_VALUE,
+    RATING_PRIOR_MEAN,
+    OUTBOX_SUBJECT_LENGTH,
+    CACHE_SCOPE_LENGTH,
+    CACHE_VERSION_LENGTH,
+    THROTTLE_KEY_LENGTH
 )
 from reviews.validators import (
     validate_username,
@@ -45,6 +52,12 @@ class User(AbstractUser):
         unique=True,
         validators=(validate_username,)
     )
+    username_folded = models.CharField(
+        'Никнейм без учёта регистра',
+        max_length=USERNAME_LENGTH,
+        db_index=True,
+        editable=False
+    )
 
     email = models.EmailField(
         'Электронная почта',
@@ -64,19 +77,37 @@ class User(AbstractUser):
         choices=Role.choices,
         default=Role.USER,
     )
-    confirmation_code = models.CharField(
-        max_length=CODE_LENGTH,
-        blank=True,
-        null=True
-    )
 
     class Meta:
         verbose_name = 'Пользователь'
         verbose_name_plural = 'Пользователи'
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Никнейм на момент загрузки: по нему видно, что его изменили.
+        self.loaded_username = self.__dict__.get('username')
+
     def __str__(self):
         return self.username
 
+    def save(self, *args, **kwargs):
+        """
+        Сохраняет пользователя вместе с никнеймом для поиска.
+        """
+        self.username_folded = self.username.casefold()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'username' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'username_folded'}
+        super().save(*args, **kwargs)
+        self.loaded_username = self.username
+
+    @property
+    def username_changed(self):
+        """
+        Проверяет, изменён ли никнейм с момента загрузки.
+        """
+        return self.loaded_username != self.username
+
     @property
     def is_user(self):
         """
@@ -176,16 +207,54 @@ class Title(models.Model):
         Genre,
         verbose_name='Жанр'
     )
+    score_sum = models.PositiveIntegerField(
+        'Сумма оценок',
+        default=0,
+        editable=False
+    )
+    review_count = models.PositiveIntegerField(
+        'Количество отзывов',
+        default=0,
+        editable=False
+    )
+    weighted_rating = models.FloatField(
+        'Взвешенный рейтинг',
+        default=RATING_PRIOR_MEAN,
+        editable=False
+    )
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
         default_related_name = 'titles'
         ordering = ('name',)
+        indexes = [
+            models.Index(
+                fields=('year', 'id'),
+                name='title_year_id_idx'
+            ),
+            models.Index(
+                fields=('weighted_rating', 'id'),
+                name='title_weighted_idx'
+            ),
+            models.Index(
+                fields=('category', 'weighted_rating'),
+                name='title_category_weighted_idx'
+            )
+        ]
 
     def __str__(self):
         return self.name[:SYMBOLS_LENGTH]
 
+    @property
+    def rating(self):
+        """
+        Возвращает рейтинг произведения по сохранённым счётчикам.
+        """
+        if not self.review_count:
+            return None
+        return self.score_sum // self.review_count
+
 
 class BaseReviewComment(models.Model):
     """
@@ -199,7 +268,8 @@ class BaseReviewComment(models.Model):
     author = models.ForeignKey(
         User,
         verbose_name='Автор',
-        on_delete=models.CASCADE
+        # Удаляются одним запросом в reviews.signals.
+        on_delete=models.DO_NOTHING
     )
     pub_date = models.DateTimeField(
         'Дата публикации',
@@ -210,7 +280,7 @@ class BaseReviewComment(models.Model):
 
     class Meta:
         abstract = True
-        ordering = ('pub_date',)
+        ordering = ('pub_date', 'id')
 
     def __str__(self):
         return self.text[:SYMBOLS_LENGTH]
@@ -224,7 +294,8 @@ class Review(BaseReviewComment):
     title = models.ForeignKey(
         Title,
         verbose_name='Произведение',
-        on_delete=models.CASCADE
+        # Удаляются одним запросом в reviews.signals.
+        on_delete=models.DO_NOTHING
     )
     score = models.PositiveSmallIntegerField(
         verbose_name='Рейтинг',
@@ -236,6 +307,11 @@ class Review(BaseReviewComment):
         ),
         db_index=True
     )
+    comment_count = models.PositiveIntegerField(
+        'Количество комментариев',
+        default=0,
+        editable=False
+    )
 
     class Meta(BaseReviewComment.Meta):
         verbose_name = 'Отзыв'
@@ -247,11 +323,37 @@ class Review(BaseReviewComment):
                 name='unique_title_author_pair'
             )
         ]
+        indexes = [
+            models.Index(
+                fields=('title', 'pub_date', 'id'),
+                name='review_title_pub_date_idx'
+            ),
+            models.Index(
+                fields=('author', 'pub_date'),
+                name='review_author_pub_date_idx'
+            )
+        ]
 
     def __str__(self):
         return (f'Рейтинг: {self.score} на {self.title} '
                 f'от {self.author}')
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Запоминает оценку из базы для пересчёта рейтинга при изменении.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_score = instance.__dict__.get('score')
+        return instance
+
+    def save(self, *args, **kwargs):
+        """
+        Сохраняет отзыв и счётчики произведения в одной транзакции.
+        """
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
 
 class Comment(BaseReviewComment):
     """
@@ -261,13 +363,182 @@ class Comment(BaseReviewComment):
     review = models.ForeignKey(
         Review,
         verbose_name='Отзыв',
-        on_delete=models.CASCADE
+        # Удаляются одним запросом в reviews.signals.
+        on_delete=models.DO_NOTHING
     )
 
     class Meta(BaseReviewComment.Meta):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
         default_related_name = 'comments'
+        indexes = [
+            models.Index(
+                fields=('review', 'pub_date', 'id'),
+                name='comment_review_pub_date_idx'
+            )
+        ]
 
     def __str__(self):
         return f'Комментарий на {self.review} от {self.author}'
+
+    def save(self, *args, **kwargs):
+        """
+        Сохраняет комментарий и счётчик отзыва в одной транзакции.
+        """
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+def score_field(score):
+    """
+    Возвращает имя поля счётчика для оценки.
+    """
+    return f'score_{score}'
+
+
+class ScoreDistribution(models.Model):
+    """
+    Модель распределения оценок произведения.
+    """
+
+    title = models.OneToOneField(
+        Title,
+        verbose_name='Произведение',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='scores'
+    )
+
+    class Meta:
+        verbose_name = 'Распределение оценок'
+        verbose_name_plural = 'Распределения оценок'
+
+    def __str__(self):
+        return f'Распределение оценок {self.title_id}'
+
+
+for score in range(MIN_VALUE, MAX_VALUE + 1):
+    ScoreDistribution.add_to_class(
+        score_field(score),
+        models.PositiveIntegerField(f'Оценка {score}', default=0)
+    )
+
+
+class ConfirmationCode(models.Model):
+    """
+    Модель кода подтверждения.
+
+    Хранится не сам код, а его HMAC; у пользователя
+    не больше одного кода, новый код заменяет прежний.
+    После CODE_MAX_ATTEMPTS неверных попыток код удаляется.
+    """
+
+    user = models.OneToOneField(
+        User,
+        verbose_name='Пользователь',
+        on_delete=models.CASCADE,
+        related_name='confirmation_code'
+    )
+    digest = models.CharField(
+        'HMAC кода',
+        max_length=CODE_DIGEST_LENGTH,
+        db_index=True
+    )
+    expires_at = models.DateTimeField('Действует до', db_index=True)
+    attempts = models.PositiveSmallIntegerField(
+        'Неудачные попытки',
+        default=0
+    )
+
+    class Meta:
+        verbose_name = 'Код подтверждения'
+        verbose_name_plural = 'Коды подтверждения'
+
+    def __str__(self):
+        return f'Код подтверждения {self.user_id}'
+
+
+class EmailOutbox(models.Model):
+    """
+    Модель очереди исходящих писем.
+
+    Письмо записывается в очередь в транзакции запроса,
+    а отправляется командой send_outbox.
+    """
+
+    recipient = models.EmailField('Получатель', max_length=EMAIL_LENGTH)
+    subject = models.CharField('Тема', max_length=OUTBOX_SUBJECT_LENGTH)
+    body = models.TextField('Текст')
+    created_at = models.DateTimeField('Создано', auto_now_add=True)
+    send_after = models.DateTimeField(
+        'Отправить после',
+        default=timezone.now
+    )
+    attempts = models.PositiveSmallIntegerField('Попытки', default=0)
+    lease = models.CharField(
+        'Захвачено обработчиком',
+        max_length=32,
+        blank=True
+    )
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    sent_at = models.DateTimeField('Отправлено', blank=True, null=True)
+
+    class Meta:
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        indexes = [
+            models.Index(
+                fields=('send_after', 'id'),
+                condition=Q(sent_at__isnull=True),
+                name='outbox_pending_idx'
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.subject} для {self.recipient}'
+
+
+class ThrottleBucket(models.Model):
+    """
+    Модель корзины токенов для ограничения частоты запросов.
+
+    Общая для всех процессов приложения. Вместо остатка токенов
+    хранится момент, когда корзина снова наполнится целиком.
+    """
+
+    key = models.CharField(
+        'Ключ',
+        max_length=THROTTLE_KEY_LENGTH,
+        primary_key=True
+    )
+    refilled_at = models.FloatField('Полностью восстановится')
+
+    class Meta:
+        verbose_name = 'Ограничение частоты запросов'
+        verbose_name_plural = 'Ограничения частоты запросов'
+
+    def __str__(self):
+        return self.key
+
+
+class CacheVersion(models.Model):
+    """
+    Модель версии области кэша.
+
+    Версии хранятся в БД, чтобы смену версии сразу видели все процессы.
+    Области, которые ещё ни разу не менялись, в таблице отсутствуют.
+    """
+
+    scope = models.CharField(
+        'Область',
+        max_length=CACHE_SCOPE_LENGTH,
+        primary_key=True
+    )
+    version = models.CharField('Версия', max_length=CACHE_VERSION_LENGTH)
+
+    class Meta:
+        verbose_name = 'Версия области кэша'
+        verbose_name_plural = 'Версии областей кэша'
+
+    def __str__(self):
+        return f'{self.scope}: {self.version}'
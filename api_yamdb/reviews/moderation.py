@@ -0,0 +1,59 @@
+from django.db import connection, transaction
+
+from reviews.counters import rebuild_review_counters, rebuild_title_counters
+from reviews.models import Comment, Review, Title
+from reviews.utils import batches
+
+
+def delete_rows(model, field, values):
+    """
+    Удаляет строки модели со значениями поля из списка одним DELETE,
+    не загружая объекты и не отправляя сигналы.
+    """
+    table = connection.ops.quote_name(model._meta.db_table)
+    column = connection.ops.quote_name(model._meta.get_field(field).column)
+    placeholders = ', '.join(['%s'] * len(values))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {table} WHERE {column} IN ({placeholders})',
+            values
+        )
+
+
+def delete_reviews(queryset, rebuild_counters=True):
+    """
+    Удаляет отзывы и их комментарии set-based запросами без сигналов
+    и в конце пересчитывает счётчики затронутых произведений.
+    Пересчёт не нужен, если удаляются и сами произведения.
+
+    Возвращает словарь id удалённых отзывов -> id их произведений.
+    """
+    with transaction.atomic():
+        rows = dict(queryset.values_list('pk', 'title_id'))
+        for batch in batches(rows):
+            delete_rows(Comment, 'review', batch)
+            delete_rows(Review, 'id', batch)
+        if rebuild_counters:
+            for batch in batches(set(rows.values())):
+                rebuild_title_counters(Title.objects.filter(pk__in=batch))
+    return rows
+
+
+def delete_comments(queryset):
+    """
+    Удаляет комментарии set-based запросами без сигналов
+    и в конце пересчитывает счётчики затронутых отзывов.
+
+    Возвращает id удалённых комментариев и словарь
+    id их отзывов -> id произведений.
+    """
+    with transaction.atomic():
+        rows = list(
+            queryset.values_list('pk', 'review_id', 'review__title_id')
+        )
+        reviews = {review_id: title_id for _, review_id, title_id in rows}
+        for batch in batches(pk for pk, _, _ in rows):
+            delete_rows(Comment, 'id', batch)
+        for batch in batches(reviews):
+            rebuild_review_counters(Review.objects.filter(pk__in=batch))
+    return [pk for pk, _, _ in rows], reviews
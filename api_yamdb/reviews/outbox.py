@@ -0,0 +1,127 @@
+from datetime import timedelta
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import F
+from django.utils import timezone
+
+from reviews.constants import (
+    OUTBOX_LEASE_SECONDS,
+    OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_RETRY_MAX_SECONDS,
+    OUTBOX_RETRY_SECONDS
+)
+from reviews.models import EmailOutbox
+
+
+def enqueue_email(recipient, subject, body):
+    """
+    Ставит письмо в очередь; оно будет отправлено командой send_outbox.
+    """
+    return EmailOutbox.objects.create(
+        recipient=recipient,
+        subject=subject,
+        body=body
+    )
+
+
+def get_pending_emails():
+    """
+    Возвращает неотправленные письма, попытки отправки которых
+    ещё не исчерпаны.
+    """
+    return EmailOutbox.objects.filter(
+        sent_at__isnull=True,
+        attempts__lt=OUTBOX_MAX_ATTEMPTS
+    )
+
+
+def get_retry_delay(attempts):
+    """
+    Возвращает задержку перед следующей попыткой: экспоненциально
+    растущую с числом попыток, но не больше OUTBOX_RETRY_MAX_SECONDS.
+    """
+    return timedelta(seconds=min(
+        OUTBOX_RETRY_SECONDS * 2 ** (attempts - 1),
+        OUTBOX_RETRY_MAX_SECONDS
+    ))
+
+
+def claim_emails(batch_size):
+    """
+    Захватывает пачку писем, срок отправки которых наступил.
+
+    Захват - условный UPDATE, поэтому параллельные обработчики
+    не получат одно письмо дважды. Если обработчик упадёт,
+    письма вернутся в очередь по истечении OUTBOX_LEASE_SECONDS.
+    """
+    now = timezone.now()
+    lease = uuid4().hex
+    ids = list(
+        get_pending_emails().filter(send_after__lte=now).order_by(
+            'send_after', 'id'
+        ).values_list('pk', flat=True)[:batch_size]
+    )
+    get_pending_emails().filter(pk__in=ids, send_after__lte=now).update(
+        lease=lease,
+        send_after=now + timedelta(seconds=OUTBOX_LEASE_SECONDS),
+        attempts=F('attempts') + 1
+    )
+    return list(EmailOutbox.objects.filter(pk__in=ids, lease=lease))
+
+
+def deliver_emails(emails):
+    """
+    Отправляет письма через одно соединение с почтовым сервером.
+
+    Возвращает id отправленных писем и словарь ошибок по письмам.
+    """
+    sent, errors = [], {}
+    try:
+        with get_connection() as connection:
+            for email in emails:
+                try:
+                    EmailMessage(
+                        subject=email.subject,
+                        body=email.body,
+                        from_email=settings.EMAIL_FROM,
+                        to=[email.recipient],
+                        connection=connection
+                    ).send()
+                except Exception as error:
+                    errors[email] = error
+                else:
+                    sent.append(email.pk)
+    except Exception as error:
+        # Соединение не открылось или оборвалось при закрытии.
+        errors.update(
+            (email, error) for email in emails if email.pk not in sent
+        )
+    return sent, errors
+
+
+def send_outbox(batch_size):
+    """
+    Отправляет одну пачку писем из очереди.
+
+    Неудачные письма откладываются с экспоненциальной задержкой.
+    Возвращает число отправленных и неудачных писем.
+    """
+    emails = claim_emails(batch_size)
+    if not emails:
+        return 0, 0
+    sent, errors = deliver_emails(emails)
+    EmailOutbox.objects.filter(pk__in=sent).update(
+        sent_at=timezone.now(),
+        lease='',
+        last_error=''
+    )
+    now = timezone.now()
+    for email, error in errors.items():
+        EmailOutbox.objects.filter(pk=email.pk).update(
+            send_after=now + get_retry_delay(email.attempts),
+            lease='',
+            last_error=f'{type(error).__name__}: {error}'
+        )
+    return len(sent), len(errors)
@@ -0,0 +1,94 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'reviews_title_fts'
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def is_supported():
+    """
+    Проверяет, что полнотекстовый индекс доступен в текущей БД.
+    """
+    return connection.vendor == 'sqlite'
+
+
+def index_titles(titles):
+    """
+    Добавляет или обновляет произведения в полнотекстовом индексе.
+    """
+    if not is_supported() or not titles:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+            [(title.pk,) for title in titles]
+        )
+        cursor.executemany(
+            f'INSERT INTO {FTS_TABLE} (rowid, name, description) '
+            'VALUES (%s, %s, %s)',
+            [(title.pk, title.name, title.description) for title in titles]
+        )
+
+
+def unindex_titles(title_ids):
+    """
+    Удаляет произведения из полнотекстового индекса.
+    """
+    if not is_supported() or not title_ids:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+            [(title_id,) for title_id in title_ids]
+        )
+
+
+def rebuild_title_index():
+    """
+    Полностью перестраивает полнотекстовый индекс по таблице произведений.
+    """
+    if not is_supported():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, name, description) '
+            'SELECT id, name, description FROM reviews_title'
+        )
+
+
+def search_titles(queryset, query):
+    """
+    Отбирает произведения по словам запроса в названии и описании.
+
+    Каждое слово ищется как префикс; в SQLite результаты упорядочены
+    по релевантности (bm25), в остальных БД применяется icontains.
+    Пагинация по курсору сортирует по (year, id), поэтому поиск
+    с ней не сочетается.
+    """
+    tokens = TOKEN_PATTERN.findall(query)
+    if not tokens:
+        return queryset
+    if not is_supported():
+        for token in tokens:
+            queryset = queryset.filter(
+                Q(name__icontains=token) | Q(description__icontains=token)
+            )
+        return queryset
+    match = ' '.join(f'"{token}"*' for token in tokens)
+    # Ранг берётся из результата MATCH, который SQLite строит один раз
+    # и ищет по автоматическому индексу: подзапрос с MATCH по rowid
+    # пересчитывал бы bm25 для каждой найденной строки.
+    return queryset.filter(id__in=RawSQL(
+        f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+        (match,)
+    )).annotate(search_rank=RawSQL(
+        'SELECT found.rank FROM ('
+        f'SELECT rowid, rank FROM {FTS_TABLE} '
+        f'WHERE {FTS_TABLE} MATCH %s LIMIT -1'
+        ') AS found WHERE found.rowid = reviews_title.id',
+        (match,)
+    )).order_by('search_rank', '-year', '-id')
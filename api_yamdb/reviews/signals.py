@@ -0,0 +1,110 @@
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from reviews.counters import (
+    apply_comment_change,
+    apply_review_change,
+    rebuild_title_counters
+)
+from reviews.models import Comment, Title, Review, User
+from reviews.moderation import delete_comments, delete_reviews, delete_rows
+from reviews.search import index_titles, unindex_titles
+
+
+@receiver(post_save, sender=Review)
+def update_title_counters_on_save(sender, instance, created, **kwargs):
+    """
+    Учитывает новый или изменённый отзыв в счётчиках произведения.
+    """
+    loaded_score = getattr(instance, '_loaded_score', None)
+    if created:
+        apply_review_change(instance.title_id, new_score=instance.score)
+    elif loaded_score is None:
+        rebuild_title_counters(Title.objects.filter(pk=instance.title_id))
+    elif loaded_score != instance.score:
+        apply_review_change(
+            instance.title_id,
+            old_score=loaded_score,
+            new_score=instance.score
+        )
+    instance._loaded_score = instance.score
+
+
+@receiver(post_delete, sender=Review)
+def update_title_counters_on_delete(sender, instance, **kwargs):
+    """
+    Исключает удалённый отзыв из счётчиков произведения.
+    """
+    apply_review_change(instance.title_id, old_score=instance.score)
+
+
+@receiver(pre_delete, sender=Review)
+def delete_review_comments(sender, instance, **kwargs):
+    """
+    Удаляет комментарии отзыва одним запросом, не пересчитывая
+    счётчик удаляемого отзыва.
+    """
+    delete_rows(Comment, 'review', [instance.pk])
+
+
+@receiver(pre_delete, sender=Title)
+def delete_title_reviews(sender, instance, **kwargs):
+    """
+    Удаляет отзывы произведения и их комментарии set-based запросами,
+    не пересчитывая счётчики удаляемого произведения.
+
+    Удалённые отзывы запоминаются в deleted_reviews для сброса кэша.
+    """
+    instance.deleted_reviews = delete_reviews(
+        Review.objects.filter(title=instance), rebuild_counters=False
+    )
+
+
+@receiver(pre_delete, sender=User)
+def delete_user_content(sender, instance, **kwargs):
+    """
+    Удаляет отзывы и комментарии пользователя set-based запросами
+    и пересчитывает счётчики затронутых произведений и отзывов.
+
+    Удалённые отзывы и отзывы удалённых комментариев запоминаются
+    в deleted_reviews и deleted_comments для сброса кэша.
+    """
+    instance.deleted_reviews = delete_reviews(
+        Review.objects.filter(author=instance)
+    )
+    instance.deleted_comments = delete_comments(
+        Comment.objects.filter(author=instance)
+    )[1]
+
+
+@receiver(post_save, sender=Comment)
+def update_review_counter_on_save(sender, instance, created, **kwargs):
+    """
+    Учитывает новый комментарий в счётчике отзыва.
+    """
+    if created:
+        apply_comment_change(instance.review_id, 1)
+
+
+@receiver(post_delete, sender=Comment)
+def update_review_counter_on_delete(sender, instance, **kwargs):
+    """
+    Исключает удалённый комментарий из счётчика отзыва.
+    """
+    apply_comment_change(instance.review_id, -1)
+
+
+@receiver(post_save, sender=Title)
+def index_title_on_save(sender, instance, **kwargs):
+    """
+    Обновляет произведение в полнотекстовом индексе.
+    """
+    index_titles([instance])
+
+
+@receiver(post_delete, sender=Title)
+def unindex_title_on_delete(sender, instance, **kwargs):
+    """
+    Удаляет произведение из полнотекстового индекса.
+    """
+    unindex_titles([instance.pk])
@@ -0,0 +1,10 @@
+from reviews.constants import QUERY_BATCH_SIZE
+
+
+def batches(values):
+    """
+    Делит значения на пачки, умещающиеся в один запрос.
+    """
+    values = sorted(values)
+    for start in range(0, len(values), QUERY_BATCH_SIZE):
+        yield values[start:start + QUERY_BATCH_SIZE]
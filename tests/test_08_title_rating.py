@@ -0,0 +1,154 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import ScoreDistribution, Title
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    TITLE_RATING_URL_TEMPLATE = '/api/v1/titles/{title_id}/rating/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def test_01_counters_follow_review_writes(self, admin_client, user_client,
+                                              moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Хорошо', 7)
+        review_id = create_single_review(
+            moderator_client, title_id, 'Неплохо', 4
+        ).json()['id']
+
+        title = Title.objects.get(pk=title_id)
+        assert (title.score_sum, title.review_count) == (11, 2), (
+            'Проверьте, что при создании отзыва обновляются сумма оценок и '
+            'количество отзывов произведения.'
+        )
+        response = admin_client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.json().get('rating') == 5, (
+            'Проверьте, что рейтинг произведения рассчитывается по '
+            'сохранённым счётчикам.'
+        )
+
+        moderator_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review_id
+            ),
+            data={'score': 10}
+        )
+        title.refresh_from_db()
+        assert (title.score_sum, title.review_count) == (17, 2), (
+            'Проверьте, что при изменении оценки в отзыве обновляется сумма '
+            'оценок произведения.'
+        )
+
+        response = moderator_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review_id
+            )
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        title.refresh_from_db()
+        assert (title.score_sum, title.review_count) == (7, 1), (
+            'Проверьте, что при удалении отзыва счётчики произведения '
+            'уменьшаются.'
+        )
+
+    def test_02_rebuild_counters_command(self, client, admin_client,
+                                         user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Хорошо', 8)
+        call_command('rebuild_counters', '--check')
+
+        Title.objects.filter(pk=title_id).update(score_sum=0, review_count=5)
+        with pytest.raises(CommandError):
+            call_command('rebuild_counters', '--check')
+        detail_url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        etag = client.get(detail_url)['ETag']
+        client.get('/api/v1/titles/')
+
+        call_command('rebuild_counters')
+        title = Title.objects.get(pk=title_id)
+        assert (title.score_sum, title.review_count) == (8, 1), (
+            'Проверьте, что команда `rebuild_counters` исправляет '
+            'расхождения в счётчиках произведений.'
+        )
+        call_command('rebuild_counters', '--check')
+        response = client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после `rebuild_counters` прежний ETag '
+            'произведения перестаёт действовать.'
+        )
+        rating = {
+            title['id']: title['rating']
+            for title in client.get('/api/v1/titles/').json()['results']
+        }
+        assert rating[title_id] == 8, (
+            'Проверьте, что после `rebuild_counters` кэш списка '
+            'произведений отдаёт исправленный рейтинг.'
+        )
+
+    def test_03_score_distribution(self, client, admin_client, user_client,
+                                   moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        url = self.TITLE_RATING_URL_TEMPLATE.format(title_id=title_id)
+
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.TITLE_RATING_URL_TEMPLATE}` '
+            'возвращает ответ со статусом 200.'
+        )
+        assert response.json() == {
+            'id': title_id,
+            'rating': None,
+            'review_count': 0,
+            'distribution': {str(score): 0 for score in range(1, 11)}
+        }
+
+        create_single_review(user_client, title_id, 'Хорошо', 7)
+        review_id = create_single_review(
+            moderator_client, title_id, 'Неплохо', 4
+        ).json()['id']
+        moderator_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review_id
+            ),
+            data={'score': 7}
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            data = client.get(url).json()
+        assert len(context.captured_queries) == 1, (
+            f'Проверьте, что GET-запрос к `{self.TITLE_RATING_URL_TEMPLATE}` '
+            'выполняет один SQL-запрос.'
+        )
+        expected = {str(score): 0 for score in range(1, 11)}
+        expected['7'] = 2
+        assert data['distribution'] == expected, (
+            'Проверьте, что распределение оценок обновляется при создании '
+            'и изменении отзывов.'
+        )
+        assert (data['rating'], data['review_count']) == (7, 2)
+
+        ScoreDistribution.objects.filter(title_id=title_id).update(score_7=0)
+        with pytest.raises(CommandError):
+            call_command('rebuild_counters', '--check')
+        call_command('rebuild_counters')
+        assert client.get(url).json()['distribution'] == expected, (
+            'Проверьте, что команда `rebuild_counters` восстанавливает '
+            'распределение оценок.'
+        )
@@ -0,0 +1,104 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_categories, create_genre
+
+
+def count_queries(request, *args, **kwargs):
+    """
+    Считает запросы к данным, без чтения версий кэша и BEGIN.
+    """
+    with CaptureQueriesContext(connection) as context:
+        response = request(*args, **kwargs)
+    return response, len([
+        query for query in context.captured_queries
+        if 'reviews_cacheversion' not in query['sql']
+        and query['sql'] != 'BEGIN'
+    ])
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09TitleQueries:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def post_titles(self, admin_client, genres, categories, amount):
+        title_ids = []
+        for number in range(amount):
+            response = admin_client.post(self.TITLES_URL, data={
+                'name': f'Произведение {number}',
+                'year': 2000 - number,
+                'genre': [genre['slug'] for genre in genres],
+                'category': categories[number % 2]['slug'],
+            })
+            title_ids.append(response.json()['id'])
+        return title_ids
+
+    def create_titles(self, admin_client, amount):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        return (
+            self.post_titles(admin_client, genres, categories, amount),
+            genres,
+            categories
+        )
+
+    def test_01_list_query_count_is_constant(self, client, admin_client):
+        _, genres, categories = self.create_titles(admin_client, 1)
+        url = f'{self.TITLES_URL}?limit=10'
+        _, single_count = count_queries(client.get, url)
+
+        self.post_titles(admin_client, genres, categories, 5)
+        response, many_count = count_queries(client.get, url)
+
+        assert len(response.json()['results']) == 6
+        assert single_count == many_count == 3, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}` выполняет '
+            'постоянное число SQL-запросов независимо от размера страницы: '
+            'подсчёт, выборка произведений с категориями и выборка жанров. '
+            f'Сейчас {single_count} и {many_count} запросов.'
+        )
+
+    def test_02_detail_query_count(self, client, admin_client):
+        title_ids, _, _ = self.create_titles(admin_client, 2)
+        _, query_count = count_queries(
+            client.get,
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=title_ids[0])
+        )
+        assert query_count == 2, (
+            'Проверьте, что GET-запрос к '
+            f'`{self.TITLES_DETAIL_URL_TEMPLATE}` выполняет два SQL-запроса: '
+            'произведение с категорией и жанры. '
+            f'Сейчас {query_count} запросов.'
+        )
+
+    def test_03_write_representation_query_count(self, admin_client):
+        title_ids, genres, categories = self.create_titles(admin_client, 1)
+        response = admin_client.post(self.TITLES_URL, data={
+            'name': 'Произведение с одним жанром',
+            'year': 1999,
+            'genre': [genres[0]['slug']],
+            'category': categories[0]['slug'],
+        })
+        title_ids.append(response.json()['id'])
+
+        update_counts = []
+        for title_id in title_ids:
+            response, query_count = count_queries(
+                admin_client.patch,
+                self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=title_id),
+                data={'name': 'Новое название'}
+            )
+            assert response.json()['genre'], (
+                'Проверьте, что ответ на PATCH-запрос к '
+                f'`{self.TITLES_DETAIL_URL_TEMPLATE}` содержит жанры.'
+            )
+            update_counts.append(query_count)
+        assert update_counts[0] == update_counts[1], (
+            'Проверьте, что PATCH-запрос к '
+            f'`{self.TITLES_DETAIL_URL_TEMPLATE}` выполняет постоянное число '
+            'SQL-запросов независимо от количества жанров произведения. '
+            f'Сейчас {update_counts[0]} и {update_counts[1]} запросов.'
+        )
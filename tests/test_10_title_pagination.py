@@ -0,0 +1,90 @@
+from http import HTTPStatus
+
+import pytest
+
+from api.pagination import TitlePagination
+
+from tests.utils import create_categories, create_genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10TitlePagination:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @staticmethod
+    def create_titles(admin_client, years):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        for number, year in enumerate(years):
+            admin_client.post('/api/v1/titles/', data={
+                'name': f'Произведение {number}',
+                'year': year,
+                'genre': [genres[0]['slug']],
+                'category': categories[0]['slug'],
+            })
+
+    def test_01_cursor_walks_all_titles(self, client, admin_client):
+        years = [2001, 1999, 2001, 1980, 2001, 1999, 2010]
+        self.create_titles(admin_client, years)
+
+        response = client.get(f'{self.TITLES_URL}?cursor=&limit=3')
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert 'count' not in data and data['previous'] is None, (
+            f'Проверьте, что в режиме курсора `{self.TITLES_URL}` не '
+            'подсчитывает общее количество записей.'
+        )
+        pages = [data['results']]
+        while data['next']:
+            data = client.get(data['next']).json()
+            pages.append(data['results'])
+        seen = [title['id'] for page in pages for title in page]
+        assert len(seen) == len(set(seen)) == len(years), (
+            f'Проверьте, что курсор `{self.TITLES_URL}` обходит все '
+            'произведения без пропусков и повторов.'
+        )
+        assert [len(page) for page in pages] == [3, 3, 1]
+        ordered = sorted(
+            (title for page in pages for title in page),
+            key=lambda title: (title['year'], title['id']),
+            reverse=True
+        )
+        assert [title['id'] for title in ordered] == seen, (
+            f'Проверьте, что курсор `{self.TITLES_URL}` упорядочивает '
+            'произведения по убыванию года и id.'
+        )
+
+        previous = client.get(data['previous']).json()
+        assert [title['id'] for title in previous['results']] == [
+            title['id'] for title in pages[1]
+        ], (
+            f'Проверьте, что ссылка `previous` курсора `{self.TITLES_URL}` '
+            'возвращает предыдущую страницу.'
+        )
+
+    def test_02_offset_mode_and_limit_cap(self, client, admin_client,
+                                          monkeypatch):
+        self.create_titles(admin_client, [2000, 2001, 2002])
+        response = client.get(f'{self.TITLES_URL}?limit=2&offset=1')
+        data = response.json()
+        assert data['count'] == 3 and len(data['results']) == 2, (
+            f'Проверьте, что `{self.TITLES_URL}` поддерживает пагинацию '
+            'limit/offset.'
+        )
+
+        monkeypatch.setattr(TitlePagination, 'max_limit', 2)
+        for url in (f'{self.TITLES_URL}?limit=1000',
+                    f'{self.TITLES_URL}?cursor=&limit=1000'):
+            response = client.get(url)
+            assert len(response.json()['results']) == 2, (
+                f'Проверьте, что `{url}` ограничивает размер страницы '
+                'значением `max_limit`.'
+            )
+
+    def test_03_invalid_cursor(self, client):
+        response = client.get(f'{self.TITLES_URL}?cursor=broken')
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            f'Проверьте, что некорректный курсор `{self.TITLES_URL}` '
+            'возвращает ответ со статусом 404.'
+        )
@@ -0,0 +1,176 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from api import mixins
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.fixture(params=('locmem', 'filebased'))
+def cache_backend(request, settings, tmp_path):
+    if request.param == 'filebased':
+        settings.CACHES = {
+            'default': {
+                'BACKEND': 'django.core.cache.backends.filebased.'
+                           'FileBasedCache',
+                'LOCATION': str(tmp_path),
+            }
+        }
+    cache.clear()
+    return request.param
+
+
+def get_counting_queries(client, url):
+    """
+    Считает запросы к данным, без чтения версий кэша.
+    """
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    return response.json(), len([
+        query for query in context.captured_queries
+        if 'reviews_cacheversion' not in query['sql']
+    ])
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11TitleListCache:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_anonymous_pages_are_cached(self, client, admin_client,
+                                           cache_backend):
+        create_titles(admin_client)
+        first, _ = get_counting_queries(client, self.TITLES_URL)
+        second, query_count = get_counting_queries(client, self.TITLES_URL)
+        assert first == second and query_count == 0, (
+            f'Проверьте, что повторный анонимный GET-запрос к '
+            f'`{self.TITLES_URL}` обслуживается из кэша без обращения к БД.'
+        )
+
+        url = f'{self.TITLES_URL}?year=1984&limit=5'
+        same_url = f'{self.TITLES_URL}?limit=5&year=1984'
+        get_counting_queries(client, url)
+        _, query_count = get_counting_queries(client, same_url)
+        assert query_count == 0, (
+            'Проверьте, что ключ кэша не зависит от порядка параметров '
+            'запроса.'
+        )
+
+    def test_02_review_invalidates_pages_with_title(self, client,
+                                                    admin_client,
+                                                    user_client,
+                                                    cache_backend):
+        titles, _, _ = create_titles(admin_client)
+        other_url = f'{self.TITLES_URL}?year={titles[1]["year"]}'
+        get_counting_queries(client, self.TITLES_URL)
+        get_counting_queries(client, other_url)
+
+        create_single_review(user_client, titles[0]['id'], 'Отлично', 9)
+
+        data, query_count = get_counting_queries(client, self.TITLES_URL)
+        rating = {title['id']: title['rating'] for title in data['results']}
+        assert query_count and rating[titles[0]['id']] == 9, (
+            'Проверьте, что новый отзыв сбрасывает кэш страниц списка '
+            'с этим произведением.'
+        )
+        _, query_count = get_counting_queries(client, other_url)
+        assert query_count == 0, (
+            'Проверьте, что отзыв не сбрасывает кэш страниц, на которых '
+            'нет этого произведения.'
+        )
+
+    def test_03_catalogue_writes_invalidate_all_pages(self, client,
+                                                      admin_client,
+                                                      cache_backend):
+        titles, categories, _ = create_titles(admin_client)
+        get_counting_queries(client, self.TITLES_URL)
+
+        admin_client.delete(f'/api/v1/categories/{categories[0]["slug"]}/')
+        data, query_count = get_counting_queries(client, self.TITLES_URL)
+        title = next(
+            title for title in data['results']
+            if title['id'] == titles[0]['id']
+        )
+        assert query_count and title['category'] is None, (
+            'Проверьте, что удаление категории сбрасывает кэш списков '
+            'произведений.'
+        )
+
+        admin_client.patch(
+            f'{self.TITLES_URL}{titles[0]["id"]}/', data={'genre': ['drama']}
+        )
+        data, query_count = get_counting_queries(client, self.TITLES_URL)
+        title = next(
+            title for title in data['results']
+            if title['id'] == titles[0]['id']
+        )
+        assert query_count and [
+            genre['slug'] for genre in title['genre']
+        ] == ['drama'], (
+            'Проверьте, что изменение жанров произведения сбрасывает кэш '
+            'списков произведений.'
+        )
+
+    def test_04_authenticated_requests_bypass_cache(self, admin_client,
+                                                    user_client):
+        create_titles(admin_client)
+        user_client.get(self.TITLES_URL)
+        _, query_count = get_counting_queries(user_client, self.TITLES_URL)
+        assert query_count, (
+            'Проверьте, что кэш списка произведений используется только '
+            'для анонимных пользователей.'
+        )
+
+    def test_05_concurrent_fills_are_invalidated(self, client, admin_client,
+                                                 user_client, cache_backend,
+                                                 monkeypatch):
+        titles, _, _ = create_titles(admin_client)
+        urls = [
+            f'{self.TITLES_URL}?limit={limit}'
+            for limit in range(len(titles), len(titles) + 4)
+        ]
+        barrier = Barrier(len(urls))
+        set_page = mixins.set_title_list_page
+
+        def set_page_together(key, data):
+            barrier.wait(timeout=10)
+            set_page(key, data)
+
+        monkeypatch.setattr(
+            mixins, 'set_title_list_page', set_page_together
+        )
+        with ThreadPoolExecutor(len(urls)) as executor:
+            assert all(
+                response.status_code == 200
+                for response in executor.map(
+                    lambda url: Client().get(url), urls
+                )
+            )
+        monkeypatch.setattr(mixins, 'set_title_list_page', set_page)
+
+        create_single_review(user_client, titles[0]['id'], 'Отлично', 9)
+        for url in urls:
+            data, query_count = get_counting_queries(client, url)
+            rating = {title['id']: title['rating'] for title in data['results']}
+            assert query_count and rating[titles[0]['id']] == 9, (
+                'Проверьте, что отзыв сбрасывает все страницы списка с '
+                'произведением, даже если они заполнялись одновременно.'
+            )
+
+    def test_06_hit_reads_versions_once(self, client, admin_client,
+                                        cache_backend):
+        create_titles(admin_client)
+        client.get(self.TITLES_URL)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.TITLES_URL)
+        assert response.status_code == 200
+        assert len(context.captured_queries) == 1, (
+            f'Проверьте, что анонимный GET-запрос к `{self.TITLES_URL}` '
+            'из кэша сверяет версии ETag и страницы одним запросом.'
+        )
@@ -0,0 +1,90 @@
+import pytest
+
+from tests.utils import create_categories, create_genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @staticmethod
+    def create_titles(admin_client, titles):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        ids = []
+        for name, description in titles:
+            response = admin_client.post('/api/v1/titles/', data={
+                'name': name,
+                'year': 2000,
+                'description': description,
+                'genre': [genres[0]['slug']],
+                'category': categories[0]['slug'],
+            })
+            ids.append(response.json()['id'])
+        return ids
+
+    def search(self, client, query):
+        response = client.get(self.TITLES_URL, {'search': query})
+        return [title['id'] for title in response.json()['results']]
+
+    def test_01_search_is_case_insensitive_for_cyrillic(self, client,
+                                                        admin_client):
+        ids = self.create_titles(admin_client, (
+            ('Война и мир', 'Роман-эпопея'),
+            ('Мирные дни', 'Про войну ни слова'),
+            ('Тихий Дон', 'Казаки'),
+        ))
+        assert self.search(client, 'ВОЙНА') == [ids[0]], (
+            f'Проверьте, что параметр `search` эндпоинта `{self.TITLES_URL}` '
+            'ищет без учёта регистра кириллицы.'
+        )
+        assert set(self.search(client, 'мир')) == {ids[0], ids[1]}, (
+            f'Проверьте, что параметр `search` эндпоинта `{self.TITLES_URL}` '
+            'ищет слова по префиксу.'
+        )
+        assert self.search(client, 'казаки дон') == [ids[2]], (
+            f'Проверьте, что параметр `search` эндпоинта `{self.TITLES_URL}` '
+            'ищет по названию и описанию и требует совпадения всех слов.'
+        )
+        assert self.search(client, '"*)(') == ids[::-1], (
+            'Проверьте, что запрос без слов не ограничивает выдачу.'
+        )
+
+    def test_02_search_follows_title_writes(self, client, admin_client):
+        ids = self.create_titles(admin_client, (('Солярис', ''),))
+        admin_client.patch(
+            f'{self.TITLES_URL}{ids[0]}/', data={'name': 'Сталкер'}
+        )
+        assert self.search(client, 'солярис') == [], (
+            'Проверьте, что изменение названия обновляет поисковый индекс.'
+        )
+        assert self.search(client, 'сталкер') == ids
+        admin_client.delete(f'{self.TITLES_URL}{ids[0]}/')
+        assert self.search(client, 'сталкер') == [], (
+            'Проверьте, что удаление произведения обновляет поисковый индекс.'
+        )
+
+    def test_03_search_is_ranked(self, client, admin_client):
+        ids = self.create_titles(admin_client, (
+            ('Дюна', 'Пустыня, пряность и песчаные черви'),
+            ('Пустыня пустыня', 'Пустыня'),
+        ))
+        assert self.search(client, 'пустыня') == [ids[1], ids[0]], (
+            f'Проверьте, что результаты `search` эндпоинта `{self.TITLES_URL}` '
+            'упорядочены по релевантности.'
+        )
+
+    def test_04_search_rejects_cursor(self, client, admin_client):
+        self.create_titles(admin_client, (('Война и мир', 'Роман'),))
+        response = client.get(
+            self.TITLES_URL, {'search': 'война', 'cursor': ''}
+        )
+        assert response.status_code == 400 and 'search' in response.json(), (
+            f'Проверьте, что `{self.TITLES_URL}` отклоняет поиск вместе '
+            'с пагинацией по курсору, которая отбросила бы сортировку '
+            'по релевантности.'
+        )
+        assert client.get(
+            self.TITLES_URL, {'search': 'война', 'limit': 1}
+        ).status_code == 200
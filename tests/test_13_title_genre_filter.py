@@ -0,0 +1,74 @@
+import pytest
+
+from tests.utils import create_categories
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13TitleGenreFilter:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @staticmethod
+    def create_titles(admin_client):
+        for name, slug in (('Рок', 'rock'), ('Хард-рок баллады',
+                                             'hard-rock-ballads'),
+                           ('Поп', 'pop')):
+            admin_client.post('/api/v1/genres/', data={
+                'name': name, 'slug': slug
+            })
+        categories = create_categories(admin_client)
+        ids = {}
+        for name, genres in (('Только рок', ['rock']),
+                             ('Рок и поп', ['rock', 'pop']),
+                             ('Баллады', ['hard-rock-ballads']),
+                             ('Поп', ['pop'])):
+            response = admin_client.post('/api/v1/titles/', data={
+                'name': name,
+                'year': 2000,
+                'genre': genres,
+                'category': categories[0]['slug'],
+            })
+            ids[name] = response.json()['id']
+        return ids
+
+    def get_ids(self, client, query):
+        data = client.get(f'{self.TITLES_URL}?{query}').json()
+        ids = [title['id'] for title in data['results']]
+        assert data['count'] == len(ids), (
+            f'Проверьте, что фильтр по жанрам `{self.TITLES_URL}` не '
+            'завышает `count` из-за дублирования строк.'
+        )
+        return set(ids)
+
+    def test_01_genre_is_matched_exactly(self, client, admin_client):
+        ids = self.create_titles(admin_client)
+        assert self.get_ids(client, 'genre=rock') == {
+            ids['Только рок'], ids['Рок и поп']
+        }, (
+            f'Проверьте, что фильтр `genre` эндпоинта `{self.TITLES_URL}` '
+            'сравнивает слаг жанра целиком, а не по подстроке.'
+        )
+        assert self.get_ids(client, 'genre=roc') == set()
+
+    def test_02_any_and_all_semantics(self, client, admin_client):
+        ids = self.create_titles(admin_client)
+        expected_any = {ids['Только рок'], ids['Рок и поп'], ids['Поп']}
+        assert self.get_ids(client, 'genre=rock,pop') == expected_any, (
+            f'Проверьте, что `{self.TITLES_URL}?genre=a,b` возвращает '
+            'произведения с любым из жанров.'
+        )
+        assert self.get_ids(client, 'genre=rock&genre=pop') == expected_any
+        assert self.get_ids(
+            client, 'genre=rock,pop&genre_match=all'
+        ) == {ids['Рок и поп']}, (
+            f'Проверьте, что `{self.TITLES_URL}?genre=a,b&genre_match=all` '
+            'возвращает произведения со всеми указанными жанрами.'
+        )
+        assert self.get_ids(
+            client, 'genre=rock,unknown&genre_match=all'
+        ) == set()
+        response = client.get(f'{self.TITLES_URL}?genre=rock&genre_match=x')
+        assert response.status_code == 400, (
+            'Проверьте, что некорректное значение `genre_match` возвращает '
+            'ответ со статусом 400.'
+        )
@@ -0,0 +1,75 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14TopTitles:
+
+    TOP_URL = '/api/v1/titles/top/'
+
+    @staticmethod
+    def create_rated_titles(admin_client, authors):
+        titles, categories, genres = create_titles(admin_client)
+        extra = admin_client.post('/api/v1/titles/', data={
+            'name': 'Один отзыв',
+            'year': 2000,
+            'genre': [genres[0]['slug']],
+            'category': categories[0]['slug'],
+        }).json()
+        for client in authors:
+            create_single_review(client, titles[0]['id'], 'Хорошо', 8)
+            create_single_review(client, titles[1]['id'], 'Плохо', 3)
+        create_single_review(authors[0], extra['id'], 'Шедевр', 10)
+        return titles, extra, categories, genres
+
+    def get_ids(self, client, query=''):
+        response = client.get(f'{self.TOP_URL}?{query}')
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.TOP_URL}` возвращает ответ '
+            'со статусом 200.'
+        )
+        return [title['id'] for title in response.json()]
+
+    def test_01_top_is_ordered_by_weighted_rating(self, client,
+                                                  admin_client,
+                                                  user_client,
+                                                  moderator_client):
+        titles, extra, _, _ = self.create_rated_titles(
+            admin_client, (admin_client, user_client, moderator_client)
+        )
+        assert self.get_ids(client) == [
+            titles[0]['id'], extra['id'], titles[1]['id']
+        ], (
+            f'Проверьте, что `{self.TOP_URL}` упорядочивает произведения по '
+            'взвешенному рейтингу, учитывающему количество отзывов.'
+        )
+        assert self.get_ids(client, 'limit=1') == [titles[0]['id']]
+        data = client.get(self.TOP_URL).json()
+        assert data[0]['weighted_rating'] == pytest.approx(
+            (8 * 3 + 10 * 5.5) / (3 + 10)
+        )
+
+    def test_02_top_by_category_and_genre(self, client, admin_client,
+                                          user_client):
+        titles, extra, categories, genres = self.create_rated_titles(
+            admin_client, (admin_client, user_client)
+        )
+        assert self.get_ids(
+            client, f'category={categories[0]["slug"]}'
+        ) == [titles[0]['id'], extra['id']], (
+            f'Проверьте, что `{self.TOP_URL}?category=` возвращает лучшие '
+            'произведения категории.'
+        )
+        assert self.get_ids(
+            client, f'genre={genres[2]["slug"]}'
+        ) == [titles[1]['id']], (
+            f'Проверьте, что `{self.TOP_URL}?genre=` возвращает лучшие '
+            'произведения жанра.'
+        )
+        response = client.get(f'{self.TOP_URL}?limit=100000')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что `{self.TOP_URL}` ограничивает параметр `limit`.'
+        )
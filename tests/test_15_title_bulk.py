@@ -0,0 +1,108 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_categories, create_genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15TitleBulk:
+
+    BULK_URL = '/api/v1/titles/bulk/'
+    TITLES_URL = '/api/v1/titles/'
+
+    @staticmethod
+    def make_items(genres, categories, amount):
+        return [
+            {
+                'name': f'Произведение {number}',
+                'year': 2000 - number,
+                'genre': [genre['slug'] for genre in genres],
+                'category': categories[number % 2]['slug'],
+            }
+            for number in range(amount)
+        ]
+
+    def post_bulk(self, client, items):
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(self.BULK_URL, data=items, format='json')
+        return response, len(context.captured_queries)
+
+    def test_01_bulk_create_reports_item_errors(self, client, admin_client,
+                                                user_client):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        items = self.make_items(genres, categories, 2)
+        items.insert(1, {**items[0], 'category': 'unknown'})
+        items.append({**items[0], 'year': 'не год'})
+        items.append({**items[0], 'genre': [genres[0]['slug'], 'unknown']})
+
+        response = user_client.post(self.BULK_URL, data=items, format='json')
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            f'Проверьте, что POST-запрос не-администратора к `{self.BULK_URL}` '
+            'возвращает ответ со статусом 403.'
+        )
+        response, _ = self.post_bulk(admin_client, items)
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос администратора к `{self.BULK_URL}` '
+            'возвращает ответ со статусом 201, если создано хотя бы одно '
+            'произведение.'
+        )
+        data = response.json()
+        assert [title['name'] for title in data['created']] == [
+            'Произведение 0', 'Произведение 1'
+        ], (
+            f'Проверьте, что `{self.BULK_URL}` создаёт корректные элементы '
+            'и возвращает их в порядке запроса.'
+        )
+        assert [error['index'] for error in data['errors']] == [1, 3, 4], (
+            f'Проверьте, что `{self.BULK_URL}` возвращает ошибки каждого '
+            'некорректного элемента с его индексом.'
+        )
+        assert set(data['errors'][0]['errors']) == {'category'}
+        assert set(data['errors'][2]['errors']) == {'genre'}
+        title = client.get(
+            f'{self.TITLES_URL}{data["created"][1]["id"]}/'
+        ).json()
+        assert title['category'] == categories[1]
+        assert sorted(genre['slug'] for genre in title['genre']) == sorted(
+            genre['slug'] for genre in genres
+        )
+        assert client.get(
+            self.TITLES_URL, {'search': 'произведение'}
+        ).json()['count'] == 2, (
+            f'Проверьте, что `{self.BULK_URL}` добавляет произведения в '
+            'поисковый индекс.'
+        )
+
+    def test_02_bulk_create_queries_do_not_grow(self, admin_client):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        _, few = self.post_bulk(
+            admin_client, self.make_items(genres, categories, 2)
+        )
+        response, many = self.post_bulk(
+            admin_client, self.make_items(genres, categories, 20)
+        )
+        assert len(response.json()['created']) == 20
+        assert few == many, (
+            f'Проверьте, что число запросов к БД в `{self.BULK_URL}` не '
+            'зависит от количества произведений.'
+        )
+
+    def test_03_bulk_create_rejects_bad_payload(self, admin_client):
+        for payload in ([], {'name': 'Не список'}):
+            response = admin_client.post(
+                self.BULK_URL, data=payload, format='json'
+            )
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что `{self.BULK_URL}` отклоняет пустой список '
+                'и данные, не являющиеся списком.'
+            )
+        response = admin_client.post(
+            self.BULK_URL, data=[{'name': 'Без года'}], format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json()['created'] == []
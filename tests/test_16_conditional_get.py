@@ -0,0 +1,136 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import CacheVersion
+
+from tests.utils import (
+    create_single_comment,
+    create_single_review,
+    create_titles
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16ConditionalGet:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def assert_not_modified(self, client, url, etag):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным '
+            '`If-None-Match` возвращает ответ со статусом 304.'
+        )
+        assert response['ETag'] == etag
+        assert len([
+            query for query in context.captured_queries
+            if 'reviews_' in query['sql']
+            and 'reviews_cacheversion' not in query['sql']
+        ]) <= 1, (
+            f'Проверьте, что ответ 304 для `{url}` только проверяет '
+            'существование ресурса и не загружает данные.'
+        )
+
+    def assert_modified(self, client, url, etag):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что после изменения данных GET-запрос к `{url}` '
+            'с устаревшим `If-None-Match` возвращает ответ со статусом 200.'
+        )
+        return response['ETag']
+
+    def test_01_titles(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        detail_url = f'{self.TITLES_URL}{titles[0]["id"]}/'
+        other_url = f'{self.TITLES_URL}{titles[1]["id"]}/'
+        etags = {}
+        for url in (self.TITLES_URL, detail_url, other_url):
+            response = client.get(url)
+            assert response.has_header('ETag'), (
+                f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+                'заголовок `ETag`.'
+            )
+            assert response.has_header('Last-Modified')
+            etags[url] = response['ETag']
+            self.assert_not_modified(client, url, etags[url])
+        response = client.get(
+            detail_url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что запрос с актуальным `If-Modified-Since` '
+            'возвращает ответ со статусом 304.'
+        )
+
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 7)
+        for url in (self.TITLES_URL, detail_url):
+            etags[url] = self.assert_modified(client, url, etags[url])
+        self.assert_not_modified(client, other_url, etags[other_url])
+
+        admin_client.patch(other_url, data={'name': 'Новое название'})
+        for url in (self.TITLES_URL, detail_url, other_url):
+            self.assert_modified(client, url, etags[url])
+
+    def test_02_reviews_and_comments(self, client, admin_client,
+                                     user_client):
+        titles, _, _ = create_titles(admin_client)
+        review = create_single_review(
+            user_client, titles[0]['id'], 'Отзыв', 7
+        ).json()
+        reviews_url = f'{self.TITLES_URL}{titles[0]["id"]}/reviews/'
+        review_url = f'{reviews_url}{review["id"]}/'
+        comments_url = f'{review_url}comments/'
+        etags = {
+            url: client.get(url)['ETag']
+            for url in (reviews_url, review_url, comments_url)
+        }
+        for url, etag in etags.items():
+            self.assert_not_modified(client, url, etag)
+
+        create_single_comment(
+            admin_client, titles[0]['id'], review['id'], 'Комментарий'
+        )
+        for url in (comments_url, review_url):
+            etags[url] = self.assert_modified(client, url, etags[url])
+        self.assert_not_modified(
+            client, f'{self.TITLES_URL}{titles[1]["id"]}/reviews/',
+            client.get(f'{self.TITLES_URL}{titles[1]["id"]}/reviews/')['ETag']
+        )
+
+        user_client.patch(review_url, data={'text': 'Новый текст'})
+        self.assert_modified(client, reviews_url, etags[reviews_url])
+        self.assert_modified(client, review_url, etags[review_url])
+
+        user_client.patch('/api/v1/users/me/', data={'first_name': 'Имя'})
+        self.assert_not_modified(client, comments_url, etags[comments_url])
+        user_client.patch('/api/v1/users/me/', data={'username': 'renamed'})
+        self.assert_modified(client, comments_url, etags[comments_url])
+
+    def test_03_missing_resources(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        review = create_single_review(
+            user_client, titles[0]['id'], 'Отзыв', 7
+        ).json()
+        last_modified = client.get(
+            f'{self.TITLES_URL}{titles[0]["id"]}/'
+        )['Last-Modified']
+        versions = CacheVersion.objects.count()
+        for url in (
+            f'{self.TITLES_URL}987654/',
+            f'{self.TITLES_URL}987654/reviews/',
+            f'{self.TITLES_URL}{titles[1]["id"]}/reviews/{review["id"]}/',
+            f'{self.TITLES_URL}{titles[1]["id"]}/reviews/{review["id"]}/'
+            'comments/',
+        ):
+            response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что условный GET-запрос к `{url}` для '
+                'несуществующего ресурса возвращает 404, а не 304.'
+            )
+        assert CacheVersion.objects.count() == versions, (
+            'Проверьте, что запросы к несуществующим ресурсам не создают '
+            'версий кэша.'
+        )
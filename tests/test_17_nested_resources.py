@@ -0,0 +1,79 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments, create_single_review, create_titles
+
+
+def get_title_queries(context):
+    return [
+        query for query in context.captured_queries
+        if 'FROM "reviews_title"' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17NestedResources:
+
+    def test_01_comment_chain_is_validated(self, admin_client, user,
+                                           user_client, moderator,
+                                           moderator_client):
+        authors_map = {user: user_client, moderator: moderator_client}
+        comments, reviews, titles = create_comments(admin_client, authors_map)
+        own_url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+            'comments/'
+        )
+        wrong_url = (
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/{reviews[0]["id"]}/'
+            'comments/'
+        )
+        response = admin_client.get(f'{own_url}{comments[0]["id"]}/')
+        assert response.status_code == HTTPStatus.OK
+        response = admin_client.get(wrong_url)
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что запрос к комментариям отзыва через чужое '
+            'произведение возвращает ответ со статусом 404.'
+        )
+        response = admin_client.get(f'{wrong_url}{comments[0]["id"]}/')
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что запрос к комментарию через чужое произведение '
+            'возвращает ответ со статусом 404.'
+        )
+        response = admin_client.post(wrong_url, data={'text': 'Текст'})
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что комментарий нельзя создать через чужое '
+            'произведение.'
+        )
+
+    def test_02_parents_are_fetched_once(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        with CaptureQueriesContext(connection) as context:
+            response = create_single_review(
+                user_client, titles[0]['id'], 'Отзыв', 5
+            )
+        assert response.status_code == HTTPStatus.CREATED
+        assert len(get_title_queries(context)) == 1, (
+            f'Проверьте, что POST-запрос к `{reviews_url}` получает '
+            'произведение из БД один раз.'
+        )
+        review_id = response.json()['id']
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(
+                f'{reviews_url}{review_id}/comments/', data={'text': 'Текст'}
+            )
+        assert response.status_code == HTTPStatus.CREATED
+        assert not get_title_queries(context), (
+            'Проверьте, что при создании комментария отзыв и произведение '
+            'проверяются одним запросом.'
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.get(f'{reviews_url}{review_id}/')
+        assert response.status_code == HTTPStatus.OK
+        assert not get_title_queries(context), (
+            'Проверьте, что получение отзыва не запрашивает произведение '
+            'отдельно.'
+        )
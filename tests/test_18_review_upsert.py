@@ -0,0 +1,72 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18ReviewUpsert:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_duplicate_is_rejected_by_constraint(self, admin_client,
+                                                    user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        data = {'text': 'Отзыв', 'score': 5}
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.CREATED
+        assert not [
+            query for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'FROM "reviews_review"' in query['sql']
+        ], (
+            f'Проверьте, что POST-запрос к `{url}` не проверяет наличие '
+            'отзыва отдельным запросом перед вставкой.'
+        )
+        response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что повторный POST-запрос к `{url}` возвращает '
+            'ответ со статусом 400.'
+        )
+        assert 'non_field_errors' in response.json()
+        assert admin_client.get(url).json()['count'] == 1
+
+    def test_02_put_me_creates_or_replaces(self, client, admin_client,
+                                           user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        ) + 'me/'
+        data = {'text': 'Черновик', 'score': 3}
+        assert client.put(url, data=data).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+        response = user_client.put(url, data=data)
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что PUT-запрос к `{url}` без отзыва пользователя '
+            'создаёт его и возвращает ответ со статусом 201.'
+        )
+        review_id = response.json()['id']
+        response = user_client.put(url, data={'text': 'Итог', 'score': 9})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что повторный PUT-запрос к `{url}` заменяет отзыв '
+            'и возвращает ответ со статусом 200.'
+        )
+        assert response.json()['id'] == review_id
+        assert response.json()['text'] == 'Итог'
+        create_single_review(admin_client, titles[0]['id'], 'Отзыв', 5)
+        title = client.get(f'/api/v1/titles/{titles[0]["id"]}/').json()
+        assert title['rating'] == 7, (
+            f'Проверьте, что PUT-запрос к `{url}` обновляет рейтинг.'
+        )
+        response = user_client.put(url, data={'text': 'Без оценки'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = user_client.put(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=0) + 'me/', data=data
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
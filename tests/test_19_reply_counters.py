@@ -0,0 +1,190 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Comment, Review
+from tests.utils import (
+    create_comments,
+    create_single_comment,
+    create_single_review
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19ReplyCounters:
+
+    TITLE_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    USER_URL_TEMPLATE = '/api/v1/users/{username}/'
+    EXTRA_COMMENTS = 10
+
+    @staticmethod
+    def count_delete_queries(client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.delete(url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        # Версии областей, которые меняются впервые, вставляются
+        # отдельным запросом: их число зависит от данных, а не от
+        # количества удаляемых строк.
+        return (
+            sum(
+                'reviews_cacheversion' not in query['sql']
+                and query['sql'] != 'BEGIN'
+                for query in context.captured_queries
+            ),
+            sum(
+                query['sql'].startswith('UPDATE "reviews_cacheversion"')
+                for query in context.captured_queries
+            )
+        )
+
+    def add_comments(self, client, title_id, review_id):
+        for idx in range(self.EXTRA_COMMENTS):
+            create_single_comment(client, title_id, review_id, f'Ещё {idx}')
+
+    def test_01_counters_follow_children(self, client, admin_client, user,
+                                         user_client, moderator,
+                                         moderator_client):
+        authors_map = {user: user_client, moderator: moderator_client}
+        comments, reviews, titles = create_comments(admin_client, authors_map)
+        title_url = self.TITLE_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        review_url = self.REVIEW_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        assert client.get(title_url).json()['review_count'] == 2, (
+            f'Проверьте, что ответ на GET-запрос к `{title_url}` содержит '
+            'количество отзывов в поле `review_count`.'
+        )
+        assert client.get(review_url).json()['comment_count'] == 2, (
+            f'Проверьте, что ответ на GET-запрос к `{review_url}` содержит '
+            'количество комментариев в поле `comment_count`.'
+        )
+        admin_client.delete(f'{review_url}comments/{comments[0]["id"]}/')
+        assert client.get(review_url).json()['comment_count'] == 1, (
+            'Проверьте, что удаление комментария уменьшает счётчик '
+            'комментариев отзыва.'
+        )
+        reviews_page = client.get(f'{title_url}reviews/').json()['results']
+        assert {
+            review['id']: review['comment_count'] for review in reviews_page
+        } == {reviews[0]['id']: 1, reviews[1]['id']: 0}
+        create_single_comment(
+            user_client, titles[0]['id'], reviews[0]['id'], 'Ещё'
+        )
+        assert client.get(review_url).json()['comment_count'] == 2
+
+    def test_02_rebuild_counters_repairs_comment_count(self, admin_client,
+                                                       user, user_client):
+        _, reviews, _ = create_comments(admin_client, {user: user_client})
+        call_command('rebuild_counters', '--check')
+        Review.objects.update(comment_count=7)
+        with pytest.raises(CommandError):
+            call_command('rebuild_counters', '--check')
+        call_command('rebuild_counters')
+        assert Review.objects.get(pk=reviews[0]['id']).comment_count == 1, (
+            'Проверьте, что команда `rebuild_counters` исправляет '
+            'расхождения в счётчиках комментариев.'
+        )
+        call_command('rebuild_counters', '--check')
+
+    def test_03_review_comments_are_deleted_in_bulk(self, client,
+                                                    admin_client, user,
+                                                    user_client, moderator,
+                                                    moderator_client):
+        authors_map = {user: user_client, moderator: moderator_client}
+        _, reviews, titles = create_comments(admin_client, authors_map)
+        title_id = titles[0]['id']
+        self.add_comments(user_client, title_id, reviews[1]['id'])
+        few = self.count_delete_queries(
+            admin_client, self.REVIEW_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[0]['id']
+            )
+        )
+        many = self.count_delete_queries(
+            admin_client, self.REVIEW_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[1]['id']
+            )
+        )
+        assert many == few, (
+            'Проверьте, что комментарии удаляемого отзыва удаляются '
+            'set-based запросами, а не по одному.'
+        )
+        assert not Comment.objects.exists()
+        assert client.get(
+            self.TITLE_URL_TEMPLATE.format(title_id=title_id)
+        ).json()['review_count'] == 0
+
+    def test_04_title_reviews_are_deleted_in_bulk(self, admin_client, user,
+                                                  user_client, moderator,
+                                                  moderator_client):
+        authors_map = {user: user_client, moderator: moderator_client}
+        _, reviews, titles = create_comments(admin_client, authors_map)
+        self.add_comments(user_client, titles[0]['id'], reviews[1]['id'])
+        create_single_review(user_client, titles[1]['id'], 'Отзыв', 3)
+        few = self.count_delete_queries(
+            admin_client,
+            self.TITLE_URL_TEMPLATE.format(title_id=titles[1]['id'])
+        )
+        many = self.count_delete_queries(
+            admin_client,
+            self.TITLE_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        )
+        assert many == few, (
+            'Проверьте, что отзывы и комментарии удаляемого произведения '
+            'удаляются set-based запросами, а не по одному.'
+        )
+        assert not Review.objects.exists()
+        assert not Comment.objects.exists()
+
+    def test_05_user_content_is_deleted_in_bulk(self, client, admin_client,
+                                                user, user_client, moderator,
+                                                moderator_client):
+        authors_map = {user: user_client, moderator: moderator_client}
+        _, reviews, titles = create_comments(admin_client, authors_map)
+        title_url = self.TITLE_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        review_url = self.REVIEW_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        admin_review = create_single_review(
+            admin_client, titles[1]['id'], 'Отзыв', 3
+        ).json()
+        admin_review_url = self.REVIEW_URL_TEMPLATE.format(
+            title_id=titles[1]['id'], review_id=admin_review['id']
+        )
+        create_single_comment(
+            user_client, titles[1]['id'], admin_review['id'], 'Ответ'
+        )
+        self.add_comments(moderator_client, titles[0]['id'], reviews[0]['id'])
+        assert client.get(review_url).json()['comment_count'] == (
+            2 + self.EXTRA_COMMENTS
+        )
+        assert client.get(title_url).json()['review_count'] == 2
+        assert client.get(admin_review_url).json()['comment_count'] == 1
+        many = self.count_delete_queries(
+            admin_client,
+            self.USER_URL_TEMPLATE.format(username=moderator.username)
+        )
+        assert client.get(review_url).json()['comment_count'] == 1, (
+            'Проверьте, что удаление пользователя удаляет его комментарии '
+            'и обновляет счётчики отзывов.'
+        )
+        assert client.get(title_url).json()['review_count'] == 1, (
+            'Проверьте, что удаление пользователя удаляет его отзывы '
+            'и обновляет счётчики произведений.'
+        )
+        few = self.count_delete_queries(
+            admin_client, self.USER_URL_TEMPLATE.format(username=user.username)
+        )
+        assert many == few, (
+            'Проверьте, что отзывы и комментарии удаляемого пользователя '
+            'удаляются set-based запросами, а не по одному.'
+        )
+        assert list(Review.objects.values_list('pk', flat=True)) == [
+            admin_review['id']
+        ]
+        assert not Comment.objects.exists()
+        assert client.get(admin_review_url).json()['comment_count'] == 0
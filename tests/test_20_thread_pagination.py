@@ -0,0 +1,98 @@
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+from api.pagination import ThreadPagination
+from reviews.models import Comment, Review
+from tests.utils import create_reviews, create_single_comment
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20ThreadPagination:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    @staticmethod
+    def walk(client, url):
+        data = client.get(url).json()
+        assert 'count' not in data, (
+            f'Проверьте, что в режиме курсора `{url}` не подсчитывает общее '
+            'количество записей.'
+        )
+        pages = [data['results']]
+        while data['next']:
+            data = client.get(data['next']).json()
+            pages.append(data['results'])
+        return pages, data
+
+    def test_01_comment_cursor_is_stable_on_equal_dates(self, admin_client,
+                                                        user, user_client):
+        reviews, titles = create_reviews(admin_client, {user: user_client})
+        for number in range(7):
+            create_single_comment(
+                user_client, titles[0]['id'], reviews[0]['id'], str(number)
+            )
+        Comment.objects.update(pub_date=timezone.now())
+        url = (
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+            + f'{reviews[0]["id"]}/comments/'
+        )
+        pages, last = self.walk(admin_client, f'{url}?cursor=&page_size=3')
+        assert [len(page) for page in pages] == [3, 3, 1]
+        seen = [comment['id'] for page in pages for comment in page]
+        assert seen == sorted(seen), (
+            f'Проверьте, что курсор `{url}` обходит комментарии с '
+            'одинаковой датой публикации по id без пропусков и повторов.'
+        )
+        previous = admin_client.get(last['previous']).json()
+        assert previous['results'] == pages[1], (
+            f'Проверьте, что ссылка `previous` курсора `{url}` возвращает '
+            'предыдущую страницу.'
+        )
+
+    def test_02_review_cursor_and_page_size_cap(self, admin_client, user,
+                                                user_client, moderator,
+                                                moderator_client,
+                                                monkeypatch):
+        reviews, titles = create_reviews(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        pages, _ = self.walk(admin_client, f'{url}?cursor=&page_size=1')
+        assert [review['id'] for page in pages for review in page] == [
+            review['id'] for review in reviews
+        ], (
+            f'Проверьте, что курсор `{url}` упорядочивает отзывы по дате '
+            'публикации.'
+        )
+        data = admin_client.get(f'{url}?page_size=1&page=2').json()
+        assert data['count'] == 2 and len(data['results']) == 1, (
+            f'Проверьте, что `{url}` поддерживает параметр `page_size`.'
+        )
+        monkeypatch.setattr(ThreadPagination, 'max_page_size', 1)
+        for query in ('page_size=1000', 'cursor=&page_size=1000'):
+            response = admin_client.get(f'{url}?{query}')
+            assert response.status_code == HTTPStatus.OK
+            assert len(response.json()['results']) == 1, (
+                f'Проверьте, что `{url}` ограничивает размер страницы '
+                'значением `max_page_size`.'
+            )
+
+    def test_03_cursor_uses_thread_index(self):
+        pub_date = timezone.now()
+        queries = (
+            Review.objects.filter(title_id=1, pub_date__gte=pub_date).exclude(
+                pub_date=pub_date, id__lte=1
+            ).order_by('pub_date', 'id'),
+            Comment.objects.filter(
+                review_id=1, pub_date__gte=pub_date
+            ).exclude(pub_date=pub_date, id__lte=1).order_by('pub_date', 'id')
+        )
+        for queryset, index in zip(queries, ('review_title_pub_date_idx',
+                                             'comment_review_pub_date_idx')):
+            plan = queryset[:6].explain()
+            assert index in plan and 'TEMP B-TREE' not in plan, (
+                f'Проверьте, что страница курсора читается по индексу '
+                f'`{index}` без сортировки: {plan}'
+            )
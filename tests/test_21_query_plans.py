@@ -0,0 +1,194 @@
+import os
+import re
+from pathlib import Path
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from api.urls import router_v1
+from tests.utils import create_comments
+
+PLANS_DIR = Path(__file__).resolve().parent / 'query_plans'
+UPDATE_PLANS_ENV = 'UPDATE_QUERY_PLANS'
+WATCHED_TABLES = ('reviews_review', 'reviews_comment', 'reviews_title')
+SCAN_PATTERN = re.compile(
+    r'^SCAN (?:TABLE )?(\w+)(?: USING (?:COVERING )?INDEX \w+)?$'
+)
+ALIAS_PATTERN = re.compile(r'"(\w+)" (?:AS )?"?([A-Z]\d+)\b')
+
+# Допустимые обходы таблиц: (маршрут, вариант запроса, таблица) -> причина.
+ALLOWED_SCANS = {
+    ('titles-list', '', 'reviews_title'): (
+        'COUNT пагинации по смещению читает весь индекс category_id; '
+        'страница обходит индекс (year, id) и останавливается на LIMIT.'
+    ),
+    ('titles-list', 'cursor=', 'reviews_title'): (
+        'Страница обходит индекс (year, id) от курсора '
+        'и останавливается на LIMIT; COUNT не выполняется.'
+    ),
+    ('titles-list', 'category={category}', 'reviews_title'): (
+        'Категория ищется по slug без учёта регистра (iexact), поэтому '
+        'COUNT и обход индекса year проверяют категорию построчно.'
+    ),
+    ('titles-top', '', 'reviews_title'): (
+        'Обход индекса weighted_rating останавливается на LIMIT.'
+    ),
+    ('titles-top', 'genre={genre}', 'reviews_title'): (
+        'Обход индекса weighted_rating с проверкой жанра по индексу '
+        'связи; останавливается на LIMIT подходящих произведений.'
+    ),
+}
+
+# Дополнительные параметры запроса для эндпоинтов с фильтрами.
+QUERY_VARIANTS = {
+    'titles-list': (
+        'cursor=',
+        'genre={genre}',
+        'genre={genre}&genre_match=all',
+        'category={category}',
+        'search=произведение',
+    ),
+    'titles-top': ('genre={genre}', 'category={category}'),
+    'reviews-list': ('cursor=', 'comments_preview=2'),
+    'reviews-export': ('output=csv',),
+    'comments-list': ('cursor=',),
+    'users-list': (
+        'search={users}',
+        'search={users}&search_mode=exact',
+        'search={users}&search_mode=contains',
+    ),
+}
+
+
+def explain(sql):
+    """
+    Возвращает план запроса SQLite в виде дерева с отступами.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        rows = cursor.fetchall()
+    depth = {}
+    lines = []
+    for node_id, parent, _, detail in rows:
+        depth[node_id] = depth.get(parent, -1) + 1
+        lines.append('  ' * depth[node_id] + detail)
+    return lines
+
+
+def find_scans(sql, plan):
+    """
+    Возвращает отслеживаемые таблицы, которые план обходит целиком,
+    в том числе по индексу.
+    """
+    aliases = {table: table for table in WATCHED_TABLES}
+    aliases.update(
+        (alias, table) for table, alias in ALIAS_PATTERN.findall(sql)
+    )
+    scans = set()
+    for line in plan:
+        match = SCAN_PATTERN.match(line.strip())
+        if match and aliases.get(match.group(1)) in WATCHED_TABLES:
+            scans.add(aliases[match.group(1)])
+    return scans
+
+
+def get_routes(seed):
+    """
+    Перечисляет GET-маршруты router_v1 с аргументами для их URL.
+    """
+    for prefix, viewset, basename in router_v1.registry:
+        lookup = viewset.lookup_url_kwarg or viewset.lookup_field
+        list_kwargs = {
+            name: seed[name] for name in ('title_id', 'review_id')
+            if f'<{name}>' in prefix
+        }
+        detail_kwargs = {**list_kwargs, lookup: seed[basename]}
+        if hasattr(viewset, 'list'):
+            yield f'{basename}-list', list_kwargs
+        if hasattr(viewset, 'retrieve'):
+            yield f'{basename}-detail', detail_kwargs
+        for action in viewset.get_extra_actions():
+            if 'get' in action.mapping:
+                yield f'{basename}-{action.url_name}', (
+                    detail_kwargs if action.detail else list_kwargs
+                )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21QueryPlans:
+
+    def seed(self, admin, admin_client, user, user_client, moderator,
+             moderator_client):
+        comments, reviews, titles = create_comments(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        title = admin_client.get(
+            reverse('titles-detail', kwargs={'pk': titles[0]['id']})
+        ).json()
+        return {
+            'users': admin.username,
+            'categories': title['category']['slug'],
+            'genres': title['genre'][0]['slug'],
+            'titles': titles[0]['id'],
+            'reviews': reviews[0]['id'],
+            'comments': comments[0]['id'],
+            'title_id': titles[0]['id'],
+            'review_id': reviews[0]['id'],
+            'genre': title['genre'][0]['slug'],
+            'category': title['category']['slug'],
+        }
+
+    def test_01_plans_do_not_scan_tables(self, admin, admin_client, user,
+                                         user_client, moderator,
+                                         moderator_client):
+        seed = self.seed(admin, admin_client, user, user_client, moderator,
+                         moderator_client)
+        update = bool(os.environ.get(UPDATE_PLANS_ENV))
+        scanned = []
+        for name, kwargs in get_routes(seed):
+            url = reverse(name, kwargs=kwargs)
+            report = []
+            for variant in ('', *QUERY_VARIANTS.get(name, ())):
+                query = variant.format(**seed)
+                with CaptureQueriesContext(connection) as context:
+                    response = admin_client.get(f'{url}?{query}')
+                    if response.streaming:
+                        b''.join(response.streaming_content)
+                assert response.status_code == 200, (
+                    f'Проверьте, что GET-запрос к `{url}?{query}` '
+                    'возвращает ответ со статусом 200.'
+                )
+                report.append(
+                    f'# GET {name}' + (f'?{query}' if query else '')
+                )
+                selects = [
+                    captured['sql'] for captured in context.captured_queries
+                    if captured['sql'].startswith('SELECT')
+                ]
+                for number, sql in enumerate(selects, 1):
+                    plan = explain(sql)
+                    report.append(f'-- query {number}')
+                    report.extend(plan)
+                    scanned.extend(
+                        f'{name}?{query}: {table}'
+                        for table in find_scans(sql, plan)
+                        if (name, variant, table) not in ALLOWED_SCANS
+                    )
+            golden = PLANS_DIR / f'{name}.txt'
+            text = '\n'.join(report) + '\n'
+            if update:
+                PLANS_DIR.mkdir(exist_ok=True)
+                golden.write_text(text, encoding='utf-8')
+            assert golden.exists() and golden.read_text(
+                encoding='utf-8'
+            ) == text, (
+                f'План запросов `{name}` изменился. Проверьте изменения и '
+                f'обновите `{golden.name}`, запустив тесты с переменной '
+                f'окружения {UPDATE_PLANS_ENV}=1.'
+            )
+        assert not scanned, (
+            'Проверьте, что запросы эндпоинтов не читают таблицы целиком: '
+            + '; '.join(scanned)
+        )
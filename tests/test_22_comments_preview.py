@@ -0,0 +1,63 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_reviews, create_single_comment
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22CommentsPreview:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def get(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        return response.json(), len(context.captured_queries)
+
+    def test_01_preview_embeds_latest_comments(self, admin_client, user,
+                                               user_client, moderator,
+                                               moderator_client):
+        reviews, titles = create_reviews(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        _, plain_queries = self.get(admin_client, url)
+        for number in range(3):
+            create_single_comment(
+                user_client, titles[0]['id'], reviews[0]['id'], str(number)
+            )
+        data, queries = self.get(admin_client, f'{url}?comments_preview=2')
+        previews = {
+            review['id']: [comment['text'] for comment in
+                           review['comments_preview']]
+            for review in data['results']
+        }
+        assert previews == {reviews[0]['id']: ['1', '2'],
+                            reviews[1]['id']: []}, (
+            f'Проверьте, что `{url}?comments_preview=K` добавляет к каждому '
+            'отзыву K последних комментариев в порядке публикации.'
+        )
+        assert queries == plain_queries + 1, (
+            f'Проверьте, что `{url}?comments_preview=K` получает комментарии '
+            'всех отзывов страницы одним запросом.'
+        )
+        assert 'comments_preview' not in admin_client.get(
+            url
+        ).json()['results'][0], (
+            'Проверьте, что без параметра `comments_preview` комментарии не '
+            'встраиваются в отзывы.'
+        )
+
+    def test_02_preview_is_capped(self, admin_client, user, user_client):
+        _, titles = create_reviews(admin_client, {user: user_client})
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        for value in ('0', '1000', 'x'):
+            response = admin_client.get(f'{url}?comments_preview={value}')
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что `{url}` отклоняет некорректное значение '
+                '`comments_preview`.'
+            )
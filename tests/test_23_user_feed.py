@@ -0,0 +1,94 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+from reviews.constants import FEED_LOOKBACK_DAYS
+from reviews.models import Comment, Review
+from tests.utils import (
+    create_single_comment,
+    create_single_review,
+    create_titles
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23UserFeed:
+
+    FEED_URL = '/api/v1/users/me/feed/'
+
+    @staticmethod
+    def create_activity(admin_client, user_client, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        own = create_single_review(user_client, titles[0]['id'], 'Моё', 5)
+        other = create_single_review(
+            moderator_client, titles[0]['id'], 'Чужое', 6
+        )
+        create_single_review(moderator_client, titles[1]['id'], 'Мимо', 7)
+        old = create_single_review(admin_client, titles[0]['id'], 'Старое', 8)
+        Review.objects.filter(pk=old.json()['id']).update(
+            pub_date=timezone.now() - timedelta(days=FEED_LOOKBACK_DAYS + 1)
+        )
+        comment = create_single_comment(
+            admin_client, titles[0]['id'], own.json()['id'], 'Ответ'
+        )
+        create_single_comment(
+            user_client, titles[0]['id'], own.json()['id'], 'Сам себе'
+        )
+        return {
+            ('review', other.json()['id']),
+            ('comment', comment.json()['id']),
+        }
+
+    def test_01_feed_items(self, client, admin_client, user_client,
+                           moderator_client):
+        expected = self.create_activity(
+            admin_client, user_client, moderator_client
+        )
+        assert client.get(self.FEED_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), (
+            f'Проверьте, что GET-запрос неавторизованного пользователя к '
+            f'`{self.FEED_URL}` возвращает ответ со статусом 401.'
+        )
+        response = user_client.get(self.FEED_URL)
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert {(item['type'], item['id']) for item in data['results']} == (
+            expected
+        ), (
+            f'Проверьте, что `{self.FEED_URL}` содержит чужие отзывы на '
+            'произведения пользователя и чужие комментарии к его отзывам '
+            'за ограниченный период.'
+        )
+        assert [item['type'] for item in data['results']] == [
+            'comment', 'review'
+        ], (
+            f'Проверьте, что `{self.FEED_URL}` упорядочен от новых записей '
+            'к старым.'
+        )
+        comment = data['results'][0]
+        assert comment['text'] == 'Ответ' and 'title' in comment
+
+    def test_02_feed_cursor(self, admin_client, user_client,
+                            moderator_client):
+        expected = self.create_activity(
+            admin_client, user_client, moderator_client
+        )
+        now = timezone.now()
+        Review.objects.filter(
+            pub_date__gte=now - timedelta(days=FEED_LOOKBACK_DAYS)
+        ).update(pub_date=now)
+        Comment.objects.update(pub_date=now)
+        data = user_client.get(f'{self.FEED_URL}?page_size=1').json()
+        seen = [(item['type'], item['id']) for item in data['results']]
+        while data['next']:
+            data = user_client.get(data['next']).json()
+            seen.extend((item['type'], item['id']) for item in data['results'])
+        assert len(seen) == len(set(seen)) and set(seen) == expected, (
+            f'Проверьте, что курсор `{self.FEED_URL}` обходит ленту без '
+            'пропусков и повторов при одинаковой дате публикации.'
+        )
+        response = user_client.get(f'{self.FEED_URL}?cursor=broken')
+        assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,112 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from reviews.models import Comment, Review
+from tests.utils import create_comments, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24BulkModeration:
+
+    MODERATION_URL = '/api/v1/moderation/delete/'
+    TITLE_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def test_01_permissions_and_filters(self, client, user_client,
+                                        moderator_client):
+        data = {'target': 'reviews', 'ids': [1]}
+        assert client.post(self.MODERATION_URL, data=data).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), (
+            f'Проверьте, что POST-запрос неавторизованного пользователя к '
+            f'`{self.MODERATION_URL}` возвращает ответ со статусом 401.'
+        )
+        response = user_client.post(self.MODERATION_URL, data=data)
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            f'Проверьте, что POST-запрос пользователя с ролью `user` к '
+            f'`{self.MODERATION_URL}` возвращает ответ со статусом 403.'
+        )
+        for invalid_data in ({'target': 'reviews'},
+                             {'target': 'titles', 'ids': [1]},
+                             {'target': 'comments', 'author': 'nobody'}):
+            response = moderator_client.post(
+                self.MODERATION_URL, data=invalid_data, format='json'
+            )
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что `{self.MODERATION_URL}` отклоняет запрос '
+                f'без условий или с некорректными данными: {invalid_data}.'
+            )
+
+    def test_02_delete_reviews_by_author(self, admin_client, user,
+                                         user_client, moderator,
+                                         moderator_client):
+        authors_map = {user: user_client, moderator: moderator_client}
+        comments, reviews, titles = create_comments(admin_client, authors_map)
+        create_single_review(user_client, titles[1]['id'], 'Спам', 1)
+        title_url = self.TITLE_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        assert admin_client.get(title_url).json()['rating'] == 5
+        response = moderator_client.post(
+            self.MODERATION_URL,
+            data={'target': 'reviews', 'author': user.username},
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {'deleted': 2}, (
+            f'Проверьте, что `{self.MODERATION_URL}` удаляет все отзывы '
+            'автора и возвращает их количество.'
+        )
+        assert set(Review.objects.values_list('pk', flat=True)) == {
+            reviews[1]['id']
+        }
+        assert not Comment.objects.exists(), (
+            'Проверьте, что вместе с отзывами удаляются их комментарии.'
+        )
+        title = admin_client.get(title_url).json()
+        assert title['review_count'] == 1, (
+            'Проверьте, что после массового удаления пересчитываются '
+            'счётчики отзывов произведений.'
+        )
+        other_url = self.TITLE_URL_TEMPLATE.format(title_id=titles[1]['id'])
+        assert admin_client.get(other_url).json()['rating'] is None, (
+            'Проверьте, что после массового удаления пересчитывается '
+            'рейтинг произведений.'
+        )
+        call_command('rebuild_counters', '--check')
+
+    def test_03_delete_comments_by_ids_and_period(self, admin_client, user,
+                                                  user_client, moderator,
+                                                  moderator_client):
+        authors_map = {user: user_client, moderator: moderator_client}
+        comments, reviews, titles = create_comments(admin_client, authors_map)
+        review_url = (
+            f'{self.TITLE_URL_TEMPLATE}reviews/{reviews[0]["id"]}/'
+        ).format(title_id=titles[0]['id'])
+        assert admin_client.get(review_url).json()['comment_count'] == 2
+        Comment.objects.filter(pk=comments[0]['id']).update(
+            pub_date=timezone.now() - timedelta(days=1)
+        )
+        response = admin_client.post(
+            self.MODERATION_URL,
+            data={
+                'target': 'comments',
+                'ids': [comment['id'] for comment in comments],
+                'until': (timezone.now() - timedelta(hours=1)).isoformat()
+            },
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {'deleted': 1}, (
+            f'Проверьте, что `{self.MODERATION_URL}` удаляет только '
+            'комментарии, подходящие под все условия.'
+        )
+        assert list(Comment.objects.values_list('pk', flat=True)) == [
+            comments[1]['id']
+        ]
+        assert admin_client.get(review_url).json()['comment_count'] == 1, (
+            'Проверьте, что после массового удаления комментариев '
+            'пересчитываются счётчики отзывов.'
+        )
+        call_command('rebuild_counters', '--check')
@@ -0,0 +1,74 @@
+import csv
+import json
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25ReviewExport:
+
+    EXPORT_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/export/'
+    EXPORT_FIELDS = ['id', 'text', 'author', 'score', 'comment_count',
+                     'pub_date']
+
+    @staticmethod
+    def read(response):
+        assert response.status_code == HTTPStatus.OK
+        assert response.streaming, (
+            'Проверьте, что выгрузка отзывов отдаётся потоком '
+            '`StreamingHttpResponse`.'
+        )
+        return b''.join(response.streaming_content).decode()
+
+    def test_01_export_ndjson(self, client, admin_client, user, user_client,
+                              moderator, moderator_client):
+        authors_map = {user: user_client, moderator: moderator_client}
+        _, reviews, titles = create_comments(admin_client, authors_map)
+        url = self.EXPORT_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        response = client.get(url)
+        assert response['Content-Type'] == 'application/x-ndjson'
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+        listed = client.get(
+            url.replace('export/', '')
+        ).json()['results']
+        assert rows == listed, (
+            f'Проверьте, что `{url}` выгружает все отзывы произведения '
+            'по одному JSON-объекту в строке с теми же полями, '
+            'что и список отзывов.'
+        )
+        assert [row['id'] for row in rows] == [
+            review['id'] for review in reviews
+        ]
+
+    def test_02_export_csv(self, client, admin_client, user, user_client):
+        _, reviews, titles = create_comments(
+            admin_client, {user: user_client}
+        )
+        url = self.EXPORT_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        response = client.get(f'{url}?output=csv')
+        assert response['Content-Type'].startswith('text/csv')
+        rows = list(csv.reader(self.read(response).splitlines()))
+        assert rows[0] == self.EXPORT_FIELDS, (
+            f'Проверьте, что CSV-выгрузка `{url}` начинается '
+            'со строки заголовков.'
+        )
+        assert [row[:4] for row in rows[1:]] == [
+            [str(reviews[0]['id']), reviews[0]['text'], user.username, '5']
+        ]
+
+    def test_03_export_errors(self, client, admin_client, user, user_client):
+        _, titles = create_comments(admin_client, {user: user_client})[1:]
+        url = self.EXPORT_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        assert client.get(f'{url}?output=xml').status_code == (
+            HTTPStatus.BAD_REQUEST
+        ), (
+            f'Проверьте, что `{url}` отклоняет неизвестный формат выгрузки.'
+        )
+        missing_url = self.EXPORT_URL_TEMPLATE.format(title_id=10 ** 6)
+        assert client.get(missing_url).status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что выгрузка отзывов несуществующего произведения '
+            'возвращает ответ со статусом 404.'
+        )
@@ -0,0 +1,116 @@
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings
+from django.core.cache.backends.filebased import FileBasedCache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.authentication import TokenUserCache, token_user_cache
+from api.cache import get_user_scope
+from reviews.models import User
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26CachedAuthentication:
+
+    USERS_ME_URL = '/api/v1/users/me/'
+    USER_DETAIL_URL_TEMPLATE = '/api/v1/users/{username}/'
+    MODERATION_URL = '/api/v1/moderation/delete/'
+
+    @staticmethod
+    def count_queries(client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        return len(context.captured_queries)
+
+    def test_01_user_is_not_loaded_again(self, client, admin_client, user,
+                                         user_client, moderator,
+                                         moderator_client):
+        _, titles = create_reviews(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        token_user_cache.clear()
+        anonymous = self.count_queries(client, url)
+        assert self.count_queries(user_client, url) == anonymous + 1
+        assert self.count_queries(user_client, url) == anonymous, (
+            'Проверьте, что повторный запрос с тем же токеном не загружает '
+            'пользователя и не обращается к БД для сверки снимка.'
+        )
+        assert self.count_queries(user_client, self.USERS_ME_URL) == 1, (
+            f'Проверьте, что `{self.USERS_ME_URL}` загружает пользователя '
+            'одним запросом.'
+        )
+        token_user_cache.clear()
+        assert self.count_queries(user_client, self.USERS_ME_URL) == 1, (
+            f'Проверьте, что `{self.USERS_ME_URL}` не загружает повторно '
+            'пользователя, уже загруженного при аутентификации.'
+        )
+        response = user_client.get(self.USERS_ME_URL)
+        assert response.json()['email'] == user.email, (
+            f'Проверьте, что `{self.USERS_ME_URL}` возвращает все поля '
+            'пользователя и при аутентификации по запомненному токену.'
+        )
+
+    def test_02_role_change_resets_snapshot(self, admin_client, user,
+                                            user_client):
+        data = {'target': 'reviews', 'ids': [1]}
+        assert user_client.post(
+            self.MODERATION_URL, data=data, format='json'
+        ).status_code == HTTPStatus.FORBIDDEN
+        admin_client.patch(
+            self.USER_DETAIL_URL_TEMPLATE.format(username=user.username),
+            data={'role': 'moderator'}
+        )
+        assert user_client.post(
+            self.MODERATION_URL, data=data, format='json'
+        ).status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение роли пользователя сразу '
+            'применяется к запомненным токенам.'
+        )
+        admin_client.delete(
+            self.USER_DETAIL_URL_TEMPLATE.format(username=user.username)
+        )
+        assert user_client.get(self.USERS_ME_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), (
+            'Проверьте, что токен удалённого пользователя перестаёт '
+            'приниматься.'
+        )
+
+    def test_03_change_in_other_process_resets_snapshot(self, moderator,
+                                                         moderator_client):
+        data = {'target': 'reviews', 'ids': [1]}
+        assert moderator_client.post(
+            self.MODERATION_URL, data=data, format='json'
+        ).status_code == HTTPStatus.OK
+        # Роль меняет другой процесс: сигналы этого процесса
+        # не срабатывают, новая версия видна только через общий кэш.
+        User.objects.filter(pk=moderator.pk).update(role='user')
+        FileBasedCache(settings.CACHES['shared']['LOCATION'], {}).set(
+            get_user_scope(moderator.pk), '1.000000-other'
+        )
+        assert moderator_client.post(
+            self.MODERATION_URL, data=data, format='json'
+        ).status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что снимок пользователя сверяется с версией, '
+            'общей для всех процессов приложения.'
+        )
+
+    def test_04_cache_is_bounded(self):
+        cache = TokenUserCache(max_size=2, timeout=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        assert (cache.get('a'), cache.get('b'), cache.get('c')) == (
+            1, None, 3
+        ), 'Проверьте, что кэш вытесняет давно не использованные записи.'
+        cache.set('d', 4, timeout=0)
+        assert cache.get('d') is None, (
+            'Проверьте, что записи кэша устаревают по истечении времени '
+            'жизни.'
+        )
@@ -0,0 +1,99 @@
+import socket
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.utils import timezone
+
+from reviews import outbox
+from reviews.models import EmailOutbox
+
+
+def get_closed_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27EmailOutbox:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def test_01_signup_enqueues_email(self, client):
+        data = {'email': 'outbox@yamdb.fake', 'username': 'outbox'}
+        response = client.post(self.URL_SIGNUP, data=data)
+        assert response.status_code == 200
+        assert not mail.outbox, (
+            f'Проверьте, что `{self.URL_SIGNUP}` не отправляет письмо '
+            'во время запроса, а ставит его в очередь.'
+        )
+        queued = EmailOutbox.objects.get()
+        assert queued.recipient == data['email'] and queued.sent_at is None
+        call_command('send_outbox')
+        assert [message.to for message in mail.outbox] == [[data['email']]], (
+            'Проверьте, что команда `send_outbox` отправляет письма '
+            'из очереди.'
+        )
+        queued.refresh_from_db()
+        assert queued.sent_at is not None
+        call_command('send_outbox')
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что команда `send_outbox` не отправляет письмо '
+            'повторно.'
+        )
+
+    def test_02_batch_uses_one_connection(self, monkeypatch):
+        connections = []
+        original_get_connection = outbox.get_connection
+
+        def get_connection():
+            connections.append(original_get_connection())
+            return connections[-1]
+
+        monkeypatch.setattr(outbox, 'get_connection', get_connection)
+        for number in range(3):
+            outbox.enqueue_email(f'user{number}@yamdb.fake', 'Тема', 'Текст')
+        assert outbox.send_outbox(batch_size=10) == (3, 0)
+        assert len(connections) == 1 and len(mail.outbox) == 3, (
+            'Проверьте, что пачка писем отправляется через одно соединение.'
+        )
+
+    def test_03_failed_email_is_retried_with_backoff(self, settings):
+        outbox.enqueue_email('retry@yamdb.fake', 'Тема', 'Текст')
+        settings.EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+        settings.EMAIL_HOST = '127.0.0.1'
+        settings.EMAIL_PORT = get_closed_port()
+        settings.EMAIL_TIMEOUT = 1
+        before = timezone.now()
+        assert outbox.send_outbox(batch_size=10) == (0, 1)
+        queued = EmailOutbox.objects.get()
+        assert queued.attempts == 1 and queued.last_error, (
+            'Проверьте, что ошибка отправки сохраняется в очереди.'
+        )
+        assert queued.send_after >= before + outbox.get_retry_delay(1), (
+            'Проверьте, что неудачное письмо откладывается на время '
+            'повторной попытки.'
+        )
+        assert outbox.send_outbox(batch_size=10) == (0, 0)
+        assert outbox.get_retry_delay(3) == outbox.get_retry_delay(1) * 4
+        settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+        EmailOutbox.objects.update(send_after=timezone.now())
+        assert outbox.send_outbox(batch_size=10) == (1, 0)
+        assert len(mail.outbox) == 1
+
+    def test_04_claimed_emails_are_leased(self):
+        outbox.enqueue_email('lease@yamdb.fake', 'Тема', 'Текст')
+        assert len(outbox.claim_emails(batch_size=10)) == 1
+        assert outbox.claim_emails(batch_size=10) == [], (
+            'Проверьте, что захваченное письмо не выдаётся другому '
+            'обработчику.'
+        )
+        EmailOutbox.objects.update(
+            send_after=timezone.now() - timedelta(seconds=1)
+        )
+        assert len(outbox.claim_emails(batch_size=10)) == 1, (
+            'Проверьте, что письмо возвращается в очередь по истечении '
+            'срока захвата.'
+        )
@@ -0,0 +1,67 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import ValidationError
+
+from api.serializers import RegistrationSerializer
+from reviews.constants import MESSAGE_DUPLICATE_USERNAME
+from reviews.models import User
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28SignupQueries:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    DATA = {'username': 'signup', 'email': 'signup@yamdb.fake'}
+
+    @staticmethod
+    def get_user_queries(context):
+        return [
+            query['sql'] for query in context.captured_queries
+            if '"reviews_user"' in query['sql']
+        ]
+
+    def test_01_signup_queries(self, client):
+        with CaptureQueriesContext(connection) as context:
+            assert client.post(self.URL_SIGNUP, data=self.DATA).json() == (
+                self.DATA
+            )
+        queries = self.get_user_queries(context)
+        assert [query.split()[0] for query in queries] == [
+            'SELECT', 'INSERT'
+        ], (
+            f'Проверьте, что регистрация через `{self.URL_SIGNUP}` ищет '
+            'пользователя одним запросом, создаёт его одной вставкой и '
+            'не перезаписывает его при выдаче кода подтверждения.'
+        )
+        with CaptureQueriesContext(connection) as context:
+            client.post(self.URL_SIGNUP, data=self.DATA)
+        assert [
+            query.split()[0] for query in self.get_user_queries(context)
+        ] == ['SELECT'], (
+            'Проверьте, что повторная регистрация не создаёт пользователя '
+            'заново.'
+        )
+
+    def test_02_concurrent_signup(self):
+        serializer = RegistrationSerializer(data=self.DATA)
+        assert serializer.is_valid()
+        User.objects.create(**self.DATA)
+        user = serializer.save()
+        assert User.objects.get().pk == user.pk, (
+            'Проверьте, что регистрация, которую опередил параллельный '
+            'запрос с теми же данными, возвращает созданного им '
+            'пользователя.'
+        )
+
+    def test_03_concurrent_conflict(self):
+        serializer = RegistrationSerializer(data=self.DATA)
+        assert serializer.is_valid()
+        User.objects.create(username=self.DATA['username'],
+                            email='other@yamdb.fake')
+        with pytest.raises(ValidationError) as error:
+            serializer.save()
+        assert MESSAGE_DUPLICATE_USERNAME in str(error.value.detail), (
+            'Проверьте, что регистрация, которую опередил параллельный '
+            'запрос с тем же username, возвращает понятную ошибку.'
+        )
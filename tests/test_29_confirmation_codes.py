@@ -0,0 +1,115 @@
+import re
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from reviews.constants import CODE_LENGTH, CODE_MAX_ATTEMPTS
+from reviews.models import ConfirmationCode, EmailOutbox
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29ConfirmationCodes:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    URL_TOKEN = '/api/v1/auth/token/'
+    DATA = {'username': 'codes', 'email': 'codes@yamdb.fake'}
+
+    def signup(self, client):
+        assert client.post(self.URL_SIGNUP, data=self.DATA).status_code == (
+            HTTPStatus.OK
+        )
+        body = EmailOutbox.objects.order_by('-id').first().body
+        return re.search(rf'\b\d{{{CODE_LENGTH}}}\b', body).group()
+
+    @staticmethod
+    def get_wrong_code(code):
+        return f'{(int(code) + 1) % 10 ** CODE_LENGTH:0{CODE_LENGTH}d}'
+
+    def get_token(self, client, code):
+        return client.post(self.URL_TOKEN, data={
+            'username': self.DATA['username'], 'confirmation_code': code
+        })
+
+    def test_01_code_is_single_use(self, client):
+        code = self.signup(client)
+        assert code not in ConfirmationCode.objects.get().digest, (
+            'Проверьте, что код подтверждения не хранится в открытом виде.'
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = self.get_token(client, code)
+        assert response.status_code == HTTPStatus.OK and 'token' in (
+            response.json()
+        )
+        code_queries = [
+            query['sql'] for query in context.captured_queries
+            if 'reviews_confirmationcode' in query['sql']
+        ]
+        assert len(code_queries) == 1, (
+            f'Проверьте, что `{self.URL_TOKEN}` проверяет и погашает код '
+            'одним запросом.'
+        )
+        assert self.get_token(client, code).status_code == (
+            HTTPStatus.BAD_REQUEST
+        ), 'Проверьте, что код подтверждения нельзя использовать повторно.'
+
+    def test_02_new_code_replaces_old(self, client):
+        old_code = self.signup(client)
+        new_code = self.signup(client)
+        if old_code != new_code:
+            assert self.get_token(client, old_code).status_code == (
+                HTTPStatus.BAD_REQUEST
+            ), 'Проверьте, что новый код отменяет прежний.'
+        assert self.get_token(client, new_code).status_code == HTTPStatus.OK
+
+    def test_03_expired_codes(self, client):
+        code = self.signup(client)
+        ConfirmationCode.objects.update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        assert self.get_token(client, code).status_code == (
+            HTTPStatus.BAD_REQUEST
+        ), 'Проверьте, что истёкший код подтверждения не принимается.'
+        client.post(self.URL_SIGNUP, data={
+            'username': 'fresh', 'email': 'fresh@yamdb.fake'
+        })
+        call_command('purge_confirmation_codes', '--batch-size', '1')
+        assert list(
+            ConfirmationCode.objects.values_list('user__username', flat=True)
+        ) == ['fresh'], (
+            'Проверьте, что команда `purge_confirmation_codes` удаляет '
+            'только истёкшие коды.'
+        )
+
+    def test_04_failed_attempts_are_counted(self, client):
+        code = self.signup(client)
+        for _ in range(CODE_MAX_ATTEMPTS - 1):
+            assert self.get_token(
+                client, self.get_wrong_code(code)
+            ).status_code == HTTPStatus.BAD_REQUEST
+        assert ConfirmationCode.objects.get().attempts == (
+            CODE_MAX_ATTEMPTS - 1
+        ), 'Проверьте, что неверный код увеличивает счётчик попыток.'
+        assert self.get_token(client, code).status_code == HTTPStatus.OK, (
+            'Проверьте, что верный код принимается, пока не исчерпаны '
+            'попытки.'
+        )
+
+    def test_05_code_is_deleted_after_max_attempts(self, client):
+        code = self.signup(client)
+        for _ in range(CODE_MAX_ATTEMPTS):
+            self.get_token(client, self.get_wrong_code(code))
+        assert not ConfirmationCode.objects.exists()
+        assert self.get_token(client, code).status_code == (
+            HTTPStatus.BAD_REQUEST
+        ), (
+            f'Проверьте, что после {CODE_MAX_ATTEMPTS} неверных попыток '
+            'код подтверждения перестаёт действовать.'
+        )
+        assert self.get_token(client, self.signup(client)).status_code == (
+            HTTPStatus.OK
+        ), 'Проверьте, что новый код выдаётся с обнулённым счётчиком.'
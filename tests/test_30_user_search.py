@@ -0,0 +1,87 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.management.commands import csv_import
+
+CSV_FILES = {
+    'users.csv': (
+        'id,username,email,role,bio,first_name,last_name\n'
+        '100,Imported,imported@yamdb.fake,user,,,\n'
+    ),
+    'category.csv': 'id,name,slug\n',
+    'genre.csv': 'id,name,slug\n',
+    'titles.csv': 'id,name,year,category\n',
+    'review.csv': 'id,title_id,text,author,score,pub_date\n',
+    'comments.csv': 'id,review_id,text,author,pub_date\n',
+}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test30UserSearch:
+
+    USERS_URL = '/api/v1/users/'
+
+    def search(self, admin_client, query):
+        response = admin_client.get(f'{self.USERS_URL}?{query}')
+        assert response.status_code == HTTPStatus.OK
+        return sorted(user['username'] for user in response.json()['results'])
+
+    def test_01_search_modes(self, admin_client, django_user_model):
+        for username in ('Alice', 'alina', 'malice', 'Ёжик'):
+            django_user_model.objects.create_user(
+                username=username, email=f'{len(username)}{username}@x.fake'
+            )
+        assert self.search(admin_client, 'search=ALI') == ['Alice', 'alina'], (
+            f'Проверьте, что `{self.USERS_URL}?search=` по умолчанию ищет '
+            'пользователей по началу никнейма без учёта регистра.'
+        )
+        assert self.search(
+            admin_client, 'search=alice&search_mode=exact'
+        ) == ['Alice'], (
+            f'Проверьте, что `{self.USERS_URL}?search_mode=exact` ищет '
+            'никнейм целиком без учёта регистра.'
+        )
+        assert self.search(
+            admin_client, 'search=lic&search_mode=contains'
+        ) == ['Alice', 'malice'], (
+            f'Проверьте, что `{self.USERS_URL}?search_mode=contains` '
+            'ищет подстроку никнейма.'
+        )
+        assert self.search(admin_client, 'search=ёж') == ['Ёжик']
+        response = admin_client.get(
+            f'{self.USERS_URL}?search=a&search_mode=regex'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_02_renamed_user_is_found(self, admin_client, user):
+        admin_client.patch(
+            f'{self.USERS_URL}{user.username}/', data={'username': 'Renamed'}
+        )
+        assert self.search(admin_client, 'search=ren') == ['Renamed'], (
+            'Проверьте, что поиск находит пользователя по новому никнейму.'
+        )
+
+    def test_03_imported_user_is_found(self, admin_client, monkeypatch,
+                                       tmp_path):
+        for name, content in CSV_FILES.items():
+            (tmp_path / name).write_text(content, encoding='utf-8')
+        monkeypatch.setattr(csv_import, 'PATH', f'{tmp_path}/')
+        call_command('csv_import')
+        assert self.search(admin_client, 'search=IMP') == ['Imported'], (
+            'Проверьте, что `csv_import` заполняет никнейм для поиска '
+            'у загруженных пользователей.'
+        )
+
+    def test_04_prefix_of_last_code_points(self, admin_client,
+                                           django_user_model):
+        django_user_model.objects.create_user(
+            username='Alice', email='alice@x.fake'
+        )
+        assert self.search(admin_client, 'search=%F4%8F%BF%BF') == [], (
+            f'Проверьте, что `{self.USERS_URL}?search=` не падает на '
+            'префиксе из последнего символа Unicode.'
+        )
+        assert self.search(admin_client, 'search=al%F4%8F%BF%BF') == []
+        assert self.search(admin_client, 'search=%ED%9F%BF') == []
@@ -0,0 +1,83 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.throttling import SharedRateThrottle
+from reviews.models import ThrottleBucket
+
+
+@pytest.mark.django_db(transaction=True)
+class Test31SharedThrottling:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    URL_TOKEN = '/api/v1/auth/token/'
+    ANON_MINUTE = 10
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        now = [1000000.0]
+        monkeypatch.setattr(
+            SharedRateThrottle, 'timer', staticmethod(lambda: now[0])
+        )
+        return now
+
+    def test_01_anon_minute_limit(self, client, clock):
+        for _ in range(self.ANON_MINUTE):
+            response = client.post(self.URL_SIGNUP, data={})
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+        cache.clear()
+        response = client.post(self.URL_SIGNUP, data={})
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что `{self.URL_SIGNUP}` ограничивает анонимные '
+            'запросы лимитом `anon_minute` в общем для процессов хранилище.'
+        )
+        assert response['Retry-After'] == '6'
+        assert client.post(self.URL_TOKEN, data={}).status_code == (
+            HTTPStatus.TOO_MANY_REQUESTS
+        ), (
+            f'Проверьте, что `{self.URL_TOKEN}` подчиняется тому же '
+            'поминутному лимиту.'
+        )
+        assert client.post(
+            self.URL_SIGNUP, data={}, REMOTE_ADDR='10.0.0.1'
+        ).status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что лимит считается отдельно для каждого IP.'
+        )
+        clock[0] += 6
+        assert client.post(self.URL_TOKEN, data={}).status_code == (
+            HTTPStatus.BAD_REQUEST
+        ), 'Проверьте, что лимит восстанавливается со временем.'
+        assert client.post(self.URL_TOKEN, data={}).status_code == (
+            HTTPStatus.TOO_MANY_REQUESTS
+        )
+
+    def test_02_one_query_per_request(self, client, user_client, clock):
+        for request_client in (client, user_client):
+            request_client.post(self.URL_SIGNUP, data={})
+            with CaptureQueriesContext(connection) as context:
+                request_client.post(self.URL_SIGNUP, data={})
+            throttle_queries = [
+                query['sql'] for query in context.captured_queries
+                if 'reviews_throttlebucket' in query['sql']
+            ]
+            assert len(throttle_queries) == 1, (
+                'Проверьте, что поминутный лимит учитывает запрос одним '
+                'обращением к базе, а анонимный запрос не попадает '
+                'в лимит `user_minute`.'
+            )
+
+    def test_03_purge_idle_buckets(self, client, clock):
+        client.post(self.URL_SIGNUP, data={})
+        clock[0] += 60
+        client.post(self.URL_SIGNUP, data={}, REMOTE_ADDR='10.0.0.1')
+        call_command('purge_throttle_buckets', '--batch-size', '1')
+        assert list(
+            ThrottleBucket.objects.order_by('key').values_list('key', flat=True)
+        ) == ['throttle_anon_minute_10.0.0.1'], (
+            'Проверьте, что команда `purge_throttle_buckets` удаляет '
+            'только наполнившиеся корзины.'
+        )